@@ -1,8 +1,9 @@
+import asyncio
 import json
 import csv
 import time
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from wikipedia_analysis import analysis
 
 # Mock the neo4j.graph.Node object for gds.util.asNode
@@ -72,6 +73,19 @@ class MockResult:
     def data(self):
         return [record._data for record in self._data]
 
+    def consume(self):
+        pass
+
+class MockAsyncResult:
+    def __init__(self, data):
+        self._data = data
+
+    async def data(self):
+        return list(self._data)
+
+    async def consume(self):
+        pass
+
 # Test PageRank calculation functions
 def test_calculate_pagerank_simple_graph(mock_neo4j_session, monkeypatch):
     """
@@ -96,8 +110,8 @@ def test_calculate_pagerank_simple_graph(mock_neo4j_session, monkeypatch):
         {"title": "Article C", "score": 0.45},
     ]
     assert pagerank_scores == expected_scores
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.pageRank.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.pageRank.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
 
 def test_calculate_pagerank_disconnected_graph(mock_neo4j_session, monkeypatch):
     """
@@ -118,8 +132,8 @@ def test_calculate_pagerank_disconnected_graph(mock_neo4j_session, monkeypatch):
         {"title": "Article F", "score": 0.15},
     ]
     assert pagerank_scores == expected_scores
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.pageRank.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.pageRank.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
 
 def test_calculate_pagerank_empty_graph(mock_neo4j_session):
     """
@@ -130,8 +144,62 @@ def test_calculate_pagerank_empty_graph(mock_neo4j_session):
     pagerank_scores = analysis.calculate_pagerank(mock_neo4j_session)
 
     assert pagerank_scores == []
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.pageRank.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.pageRank.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
+
+def test_calculate_pagerank_fallback_power_iteration(mock_neo4j_session):
+    """
+    Test the in-memory PageRank fallback when the GDS call fails.
+    """
+    pytest.importorskip("scipy")
+    nodes = [{"id": 10, "title": "Article A"}, {"id": 20, "title": "Article B"}, {"id": 30, "title": "Article C"}]
+    edges = [{"a": 10, "b": 20}, {"a": 30, "b": 20}, {"a": 20, "b": 10}]
+    mock_neo4j_session.run.side_effect = [Exception("GDS unavailable"), MockResult(nodes), MockResult(edges)]
+
+    pagerank_scores = analysis.calculate_pagerank(mock_neo4j_session)
+
+    assert [r["title"] for r in pagerank_scores] == ["Article B", "Article A", "Article C"]
+    assert sum(r["score"] for r in pagerank_scores) == pytest.approx(1.0)
+    assert "LINKS_TO" in mock_neo4j_session.run.call_args_list[2][0][0]
+
+def test_calculate_pagerank_fallback_without_scipy(mock_neo4j_session, monkeypatch):
+    """
+    Test PageRank falls back to in-degree scoring when SciPy is unavailable.
+    """
+    monkeypatch.setattr(analysis, "SCIPY_AVAILABLE", False)
+    mock_results_data = [{"title": "Article B", "score": 3.0}, {"title": "Article A", "score": 1.0}]
+    mock_neo4j_session.run.side_effect = [Exception("GDS unavailable"), MockResult(mock_results_data)]
+
+    pagerank_scores = analysis.calculate_pagerank(mock_neo4j_session)
+
+    assert pagerank_scores == mock_results_data
+    assert "inbound_links" in mock_neo4j_session.run.call_args[0][0]
+
+def test_calculate_pagerank_passes_limit_to_cypher(mock_neo4j_session):
+    """
+    Test the top-K limit is applied in the query rather than in Python.
+    """
+    mock_neo4j_session.run.return_value = MockResult([{"title": "Article A", "score": 0.85}])
+
+    analysis.calculate_pagerank(mock_neo4j_session, limit=1)
+    assert "LIMIT $limit" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_args[1]["limit"] == 1
+
+    analysis.calculate_pagerank(mock_neo4j_session)
+    assert mock_neo4j_session.run.call_args[1]["limit"] == analysis._NO_LIMIT
+
+def test_calculate_pagerank_fallback_power_iteration_limit(mock_neo4j_session):
+    """
+    Test the in-memory PageRank fallback also honours the limit.
+    """
+    pytest.importorskip("scipy")
+    nodes = [{"id": 10, "title": "Article A"}, {"id": 20, "title": "Article B"}, {"id": 30, "title": "Article C"}]
+    edges = [{"a": 10, "b": 20}, {"a": 30, "b": 20}, {"a": 20, "b": 10}]
+    mock_neo4j_session.run.side_effect = [Exception("GDS unavailable"), MockResult(nodes), MockResult(edges)]
+
+    pagerank_scores = analysis.calculate_pagerank(mock_neo4j_session, limit=2)
+
+    assert [r["title"] for r in pagerank_scores] == ["Article B", "Article A"]
 
 # Test shortest path algorithms
 def test_find_shortest_path_exists(mock_neo4j_session, monkeypatch):
@@ -147,8 +215,8 @@ def test_find_shortest_path_exists(mock_neo4j_session, monkeypatch):
 
     expected_path = [{"path": ["Article A", "Article B", "Article C"], "length": 2.0}]
     assert path_results == expected_path
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.shortestPath.bfs.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.shortestPath.bfs.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
     assert mock_neo4j_session.run.call_args[1]['start_node_title'] == "Article A"
     assert mock_neo4j_session.run.call_args[1]['end_node_title'] == "Article C"
 
@@ -162,8 +230,8 @@ def test_find_shortest_path_not_exists(mock_neo4j_session, monkeypatch):
     path_results = analysis.find_shortest_path(mock_neo4j_session, "Article X", "Article Y")
 
     assert path_results == []
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.shortestPath.bfs.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.shortestPath.bfs.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
     assert mock_neo4j_session.run.call_args[1]['start_node_title'] == "Article X"
     assert mock_neo4j_session.run.call_args[1]['end_node_title'] == "Article Y"
 
@@ -180,8 +248,8 @@ def test_find_shortest_path_same_node(mock_neo4j_session, monkeypatch):
 
     expected_path = [{"path": ["Article A"], "length": 0.0}]
     assert path_results == expected_path
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.shortestPath.bfs.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.shortestPath.bfs.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
     assert mock_neo4j_session.run.call_args[1]['start_node_title'] == "Article A"
     assert mock_neo4j_session.run.call_args[1]['end_node_title'] == "Article A"
 
@@ -191,10 +259,8 @@ def test_detect_communities_clear_structure(mock_neo4j_session, monkeypatch):
     Test community detection with a clear community structure.
     """
     mock_results_data = [
-        {"title": "Article A", "communityId": 1},
-        {"title": "Article B", "communityId": 1},
-        {"title": "Article C", "communityId": 2},
-        {"title": "Article D", "communityId": 2},
+        {"communityId": 1, "titles": ["Article A", "Article B"]},
+        {"communityId": 2, "titles": ["Article C", "Article D"]},
     ]
     mock_neo4j_session.run.return_value = MockResult(mock_results_data)
 
@@ -205,19 +271,17 @@ def test_detect_communities_clear_structure(mock_neo4j_session, monkeypatch):
         2: ["Article C", "Article D"],
     }
     assert communities == expected_communities
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.louvain.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.louvain.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
+    assert "collect(title) AS titles" in mock_neo4j_session.run.call_args[0][0]
 
 def test_detect_communities_ambiguous_structure(mock_neo4j_session, monkeypatch):
     """
     Test community detection with a more ambiguous community structure.
     """
     mock_results_data = [
-        {"title": "Article A", "communityId": 1},
-        {"title": "Article B", "communityId": 1},
-        {"title": "Article C", "communityId": 1},
-        {"title": "Article D", "communityId": 2},
-        {"title": "Article E", "communityId": 2},
+        {"communityId": 1, "titles": ["Article A", "Article B", "Article C"]},
+        {"communityId": 2, "titles": ["Article D", "Article E"]},
     ]
     mock_neo4j_session.run.return_value = MockResult(mock_results_data)
 
@@ -228,8 +292,8 @@ def test_detect_communities_ambiguous_structure(mock_neo4j_session, monkeypatch)
         2: ["Article D", "Article E"],
     }
     assert communities == expected_communities
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.louvain.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.louvain.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
 
 def test_detect_communities_empty_graph(mock_neo4j_session):
     """
@@ -240,8 +304,25 @@ def test_detect_communities_empty_graph(mock_neo4j_session):
     communities = analysis.detect_communities(mock_neo4j_session)
 
     assert communities == {}
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.louvain.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.louvain.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
+
+def test_detect_communities_fallback_louvain(mock_neo4j_session):
+    """
+    Test the in-memory Louvain fallback splits two triangles joined by a single link.
+    """
+    titles = ["Article A", "Article B", "Article C", "Article D", "Article E", "Article F"]
+    nodes = [{"id": i, "title": t} for i, t in enumerate(titles)]
+    links = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (2, 3)]
+    edges = [{"a": a, "b": b} for a, b in links]
+    mock_neo4j_session.run.side_effect = [Exception("GDS unavailable"), MockResult(nodes), MockResult(edges)]
+
+    communities = analysis.detect_communities(mock_neo4j_session)
+
+    assert sorted(communities.values()) == [
+        ["Article A", "Article B", "Article C"],
+        ["Article D", "Article E", "Article F"],
+    ]
 
 # Test centrality measure calculations
 def test_calculate_centrality_betweenness(mock_neo4j_session, monkeypatch):
@@ -261,8 +342,9 @@ def test_calculate_centrality_betweenness(mock_neo4j_session, monkeypatch):
         {"title": "Article B", "score": 5.2},
     ]
     assert centrality_scores == expected_scores
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.betweenness.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.betweenness.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_args[1]["project_name"] == "wikipedia"
 
 def test_calculate_centrality_closeness(mock_neo4j_session, monkeypatch):
     """
@@ -281,8 +363,38 @@ def test_calculate_centrality_closeness(mock_neo4j_session, monkeypatch):
         {"title": "Article Y", "score": 0.6},
     ]
     assert centrality_scores == expected_scores
-    mock_neo4j_session.run.assert_called_once()
-    assert "CALL gds.closeness.stream('wikipedia'" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_count == 2
+    assert "CALL gds.closeness.stream($project_name" in mock_neo4j_session.run.call_args[0][0]
+    assert mock_neo4j_session.run.call_args[1]["project_name"] == "wikipedia"
+
+def test_calculate_centrality_betweenness_fallback_brandes(mock_neo4j_session):
+    """
+    Test the in-memory Brandes fallback when the GDS betweenness call fails.
+    """
+    pytest.importorskip("scipy")
+    # Chain A -> B -> C: only B lies on a shortest path between other nodes.
+    nodes = [{"id": 1, "title": "Article A"}, {"id": 2, "title": "Article B"}, {"id": 3, "title": "Article C"}]
+    edges = [{"a": 1, "b": 2}, {"a": 2, "b": 3}]
+    mock_neo4j_session.run.side_effect = [Exception("GDS unavailable"), MockResult(nodes), MockResult(edges)]
+
+    centrality_scores = analysis.calculate_centrality(mock_neo4j_session, centrality_type="betweenness")
+
+    assert centrality_scores[0] == {"title": "Article B", "score": 1.0}
+    assert {r["score"] for r in centrality_scores[1:]} == {0.0}
+
+def test_betweenness_centrality_parallel_matches_serial():
+    """
+    Test that partitioning sources across worker processes gives the same scores.
+    """
+    pytest.importorskip("scipy")
+    titles = ["A", "B", "C", "D", "E"]
+    sources = [0, 1, 2, 3, 1, 4]
+    targets = [1, 2, 3, 4, 3, 0]
+
+    serial = analysis._betweenness_centrality(titles, sources, targets, processes=1)
+    parallel = analysis._betweenness_centrality(titles, sources, targets, processes=2)
+
+    assert parallel == serial
 
 def test_calculate_centrality_unsupported_type(mock_neo4j_session):
     """
@@ -292,6 +404,173 @@ def test_calculate_centrality_unsupported_type(mock_neo4j_session):
         analysis.calculate_centrality(mock_neo4j_session, centrality_type="unsupported")
 
 # Test result formatting and export functions
+def test_mock_gds_as_node_passes_through_node_shaped_values():
+    """
+    Test MockGDS.util.asNode returns mappings and neo4j Nodes unchanged and
+    wraps anything else, including objects that merely expose get().
+    """
+    from neo4j.graph import Node
+
+    mapping = {"title": "A"}
+    node = Mock(spec=Node)
+    assert analysis.MockGDS.util.asNode(mapping) is mapping
+    assert analysis.MockGDS.util.asNode(node) is node
+    assert analysis.MockGDS.util.asNode(7) == {"title": "7", "id": 7}
+    getter = Mock()
+    assert analysis.MockGDS.util.asNode(getter) == {"title": str(getter), "id": getter}
+
+# Test GDS projection management
+def test_analysis_ensures_projection_before_streaming(mock_neo4j_session):
+    """
+    Test GDS calls project the graph (if missing) before streaming from it.
+    """
+    mock_neo4j_session.run.return_value = MockResult([])
+
+    analysis.calculate_pagerank(mock_neo4j_session, project_name="custom")
+
+    ensure_call, stream_call = mock_neo4j_session.run.call_args_list
+    assert "WHERE NOT exists" in ensure_call[0][0]
+    assert "gds.graph.project($project_name, 'Article'" in ensure_call[0][0]
+    assert ensure_call[1]["project_name"] == "custom"
+    assert stream_call[1]["project_name"] == "custom"
+
+def test_gds_graph_projects_and_drops(mock_neo4j_session):
+    """
+    Test gds_graph creates a missing projection and drops it afterwards.
+    """
+    mock_neo4j_session.run.return_value.single.return_value = {"exists": False}
+
+    with analysis.gds_graph(mock_neo4j_session) as name:
+        assert name == "wikipedia"
+
+    queries = [c[0][0] for c in mock_neo4j_session.run.call_args_list]
+    assert len(queries) == 3
+    assert "gds.graph.project.cypher" in queries[1]
+    assert "gds.graph.drop" in queries[2]
+    assert mock_neo4j_session.run.return_value.consume.call_count == 2
+
+def test_gds_graph_projection_skips_ensure_projection(mock_neo4j_session):
+    """
+    Test analysis calls inside gds_graph do not re-check the projection.
+    """
+    mock_neo4j_session.run.return_value.single.return_value = {"exists": True}
+
+    with analysis.gds_graph(mock_neo4j_session, "custom") as name:
+        mock_neo4j_session.run.reset_mock()
+        mock_neo4j_session.run.return_value = MockResult([])
+        analysis.calculate_pagerank(mock_neo4j_session, project_name=name)
+
+    stream_call, = mock_neo4j_session.run.call_args_list
+    assert "gds.pageRank.stream" in stream_call[0][0]
+    assert stream_call[1]["project_name"] == "custom"
+
+def test_gds_graph_name_is_ensured_again_after_exit(mock_neo4j_session):
+    """
+    Test a projection name kept past its gds_graph block is re-checked.
+    """
+    mock_neo4j_session.run.return_value.single.return_value = {"exists": False}
+    with analysis.gds_graph(mock_neo4j_session, "custom") as name:
+        pass
+
+    mock_neo4j_session.run.reset_mock()
+    mock_neo4j_session.run.return_value = MockResult([])
+    analysis.calculate_pagerank(mock_neo4j_session, project_name=name)
+
+    ensure_call, stream_call = mock_neo4j_session.run.call_args_list
+    assert "WHERE NOT exists" in ensure_call[0][0]
+    assert not analysis._LIVE_PROJECTIONS
+
+def test_gds_graph_reuses_existing_projection(mock_neo4j_session):
+    """
+    Test gds_graph leaves an existing projection alone.
+    """
+    mock_neo4j_session.run.return_value.single.return_value = {"exists": True}
+
+    with analysis.gds_graph(mock_neo4j_session, "custom") as name:
+        assert name == "custom"
+
+    mock_neo4j_session.run.assert_called_once()
+
+# Test async variants
+def test_async_variants_run_concurrently():
+    """
+    Test the async variants can be gathered over separate sessions.
+    """
+    pagerank_session = Mock()
+    pagerank_session.run = AsyncMock(return_value=MockAsyncResult([{"title": "Article A", "score": 0.5}]))
+    communities_session = Mock()
+    communities_session.run = AsyncMock(return_value=MockAsyncResult([
+        {"communityId": 1, "titles": ["Article A", "Article B"]},
+    ]))
+
+    async def run_both():
+        return await asyncio.gather(
+            analysis.calculate_pagerank_async(pagerank_session),
+            analysis.detect_communities_async(communities_session),
+        )
+
+    pagerank, communities = asyncio.run(run_both())
+
+    assert pagerank == [{"title": "Article A", "score": 0.5}]
+    assert communities == {1: ["Article A", "Article B"]}
+    assert "CALL gds.pageRank.stream($project_name" in pagerank_session.run.call_args[0][0]
+
+def test_run_analyses_async_uses_session_per_algorithm():
+    """
+    Test the orchestrator ensures the projection once, then gathers each
+    algorithm on its own session.
+    """
+    rows_by_algo = {
+        "pageRank": [{"title": "Article A", "score": 0.5}],
+        "louvain": [{"communityId": 1, "titles": ["Article A"]}],
+        "betweenness": [{"title": "Article A", "score": 2.0}],
+    }
+    sessions = []
+
+    async def run(query, **kwargs):
+        for algo, rows in rows_by_algo.items():
+            if f"gds.{algo}.stream" in query:
+                return MockAsyncResult(rows)
+        return MockAsyncResult([])
+
+    class _Session:
+        def __init__(self):
+            self.run = AsyncMock(side_effect=run)
+            sessions.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    driver = Mock()
+    driver.session.side_effect = lambda **kwargs: _Session()
+
+    results = asyncio.run(analysis.run_analyses_async(driver))
+
+    assert results == {
+        "pagerank": rows_by_algo["pageRank"],
+        "communities": {1: ["Article A"]},
+        "centrality": rows_by_algo["betweenness"],
+    }
+    assert len(sessions) == 4
+    assert "WHERE NOT exists" in sessions[0].run.call_args[0][0]
+
+def test_calculate_centrality_async_fallback_brandes():
+    """
+    Test the async variant falls back to the in-memory Brandes pass.
+    """
+    pytest.importorskip("scipy")
+    nodes = [{"id": 1, "title": "Article A"}, {"id": 2, "title": "Article B"}, {"id": 3, "title": "Article C"}]
+    edges = [{"a": 1, "b": 2}, {"a": 2, "b": 3}]
+    session = Mock()
+    session.run = AsyncMock(side_effect=[Exception("GDS unavailable"), MockAsyncResult(nodes), MockAsyncResult(edges)])
+
+    centrality_scores = asyncio.run(analysis.calculate_centrality_async(session, centrality_type="betweenness"))
+
+    assert centrality_scores[0] == {"title": "Article B", "score": 1.0}
+
 def test_export_results_json(tmp_path):
     """
     Test exporting results to JSON format.
@@ -305,6 +584,23 @@ def test_export_results_json(tmp_path):
 
     assert exported_data == data
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_export_results_jsonl(tmp_path, monkeypatch, use_orjson):
+    """
+    Test exporting results to JSON Lines format from a generator.
+    """
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(analysis, "ORJSON_AVAILABLE", use_orjson)
+    data = [{"title": "Article A", "score": 0.85}, {"title": "Article B", "score": 0.65}]
+    filename = tmp_path / "test_results"
+    analysis.export_results((row for row in data), format_type="jsonl", filename=str(filename))
+
+    with open(f"{filename}.jsonl", "r") as f:
+        exported_data = [json.loads(line) for line in f]
+
+    assert exported_data == data
+
 def test_export_results_csv(tmp_path):
     """
     Test exporting results to CSV format.
@@ -323,6 +619,94 @@ def test_export_results_csv(tmp_path):
     ]
     assert exported_data == expected_data
 
+@pytest.mark.parametrize("data", [
+    [{"title": "Article A", "score": 0.85, "ok": True}, {"title": "Article B", "score": 1.0, "ok": False}],
+    [{"title": "Article \"A\", 1", "score": 0.85}, {"title": "Article B", "score": None}],
+    [{"title": "Big", "count": 2 ** 70}, {"title": "Small", "count": 1}],
+    [{"title": "Mixed", "value": 1}, {"title": "Types", "value": "one"}],
+    [{"title": ""}, {"title": "Article B"}],
+])
+def test_export_results_csv_backends(tmp_path, monkeypatch, data):
+    """
+    Test the pyarrow and csv-module CSV writers produce identical files.
+    """
+    pytest.importorskip("pyarrow")
+    texts = []
+    for use_pyarrow in (True, False):
+        monkeypatch.setattr(analysis, "PYARROW_AVAILABLE", use_pyarrow)
+        filename = tmp_path / f"results_{use_pyarrow}"
+        analysis.export_results(data, format_type="csv", filename=str(filename))
+        with open(f"{filename}.csv", "rb") as f:
+            texts.append(f.read())
+
+    assert texts[0] == texts[1]
+
+def test_export_results_csv_uses_arrow_for_plain_columns(tmp_path):
+    """
+    Test plain string/number/bool columns take the Arrow writer.
+    """
+    pytest.importorskip("pyarrow")
+    csv_path = str(tmp_path / "results.csv")
+
+    assert analysis._write_csv_arrow([{"title": "A", "score": 0.1, "ok": True}], csv_path) is True
+    with open(csv_path, "rb") as f:
+        assert f.read() == b"title,score,ok\r\nA,0.1,True\r\n"
+
+def test_export_results_csv_list_column(tmp_path):
+    """
+    Test list-valued results (shortest paths) still export to CSV.
+    """
+    data = [{"path": ["Article A", "Article B"], "length": 1}]
+    filename = tmp_path / "test_results"
+    analysis.export_results(data, format_type="csv", filename=str(filename))
+
+    with open(f"{filename}.csv", "r") as f:
+        exported_data = list(csv.DictReader(f))
+
+    assert exported_data == [{"path": "['Article A', 'Article B']", "length": "1"}]
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_export_results_json_indent(tmp_path, monkeypatch, use_orjson):
+    """
+    Test JSON exports are compact by default and indented on request.
+    """
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(analysis, "ORJSON_AVAILABLE", use_orjson)
+    data = [{"title": "Article A", "score": 0.85}]
+    compact, pretty = tmp_path / "compact", tmp_path / "pretty"
+    analysis.export_results(data, format_type="json", filename=str(compact))
+    analysis.export_results(data, format_type="json", filename=str(pretty), indent=True)
+
+    compact_text = (tmp_path / "compact.json").read_text()
+    pretty_text = (tmp_path / "pretty.json").read_text()
+    assert "\n" not in compact_text
+    assert "\n  " in pretty_text
+    assert json.loads(compact_text) == json.loads(pretty_text) == data
+
+def test_export_results_json_int_keys(tmp_path):
+    """
+    Test community results keyed by integer id export to JSON.
+    """
+    filename = tmp_path / "test_results"
+    analysis.export_results({1: ["Article A"]}, format_type="json", filename=str(filename))
+
+    with open(f"{filename}.json", "r") as f:
+        assert json.load(f) == {"1": ["Article A"]}
+
+def test_export_results_csv_single_column(tmp_path):
+    """
+    Test exporting single-column results to CSV format.
+    """
+    data = [{"title": "Article A"}, {"title": "Article B"}]
+    filename = tmp_path / "test_results"
+    analysis.export_results(data, format_type="csv", filename=str(filename))
+
+    with open(f"{filename}.csv", "r") as f:
+        exported_data = list(csv.DictReader(f))
+
+    assert exported_data == data
+
 def test_export_results_unsupported_format():
     """
     Test unsupported export format raises ValueError.
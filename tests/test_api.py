@@ -20,6 +20,15 @@ def _mock_session(records):
     return mock_session
 
 
+def _mock_single_session(record):
+    """Return a context-manager mock whose session.run().single() returns the given record."""
+    mock_session = MagicMock()
+    mock_session.run.return_value.single.return_value = record
+    mock_session.__enter__ = lambda s: s
+    mock_session.__exit__ = MagicMock(return_value=False)
+    return mock_session
+
+
 # ---------------------------------------------------------------------------
 # GET /
 # ---------------------------------------------------------------------------
@@ -68,17 +77,18 @@ def test_get_categories_db_error(client):
 # ---------------------------------------------------------------------------
 
 def test_get_articles_in_category_success(client):
-    records = [{"articleTitle": "Graph theory"}, {"articleTitle": "Dijkstra's algorithm"}]
-    mock_sess = _mock_session(records)
+    record = {"titles": ["Graph theory", "Dijkstra's algorithm"]}
+    mock_sess = _mock_single_session(record)
     with patch("wikipedia_analysis.api.get_db_session", return_value=mock_sess):
         resp = client.get("/category/Computer%20science")
     assert resp.status_code == 200
     data = json.loads(resp.data)
     assert data == ["Graph theory", "Dijkstra's algorithm"]
+    assert mock_sess.run.call_args[1]["category_name"] == "Computer science"
 
 
 def test_get_articles_in_category_empty_result(client):
-    mock_sess = _mock_session([])
+    mock_sess = _mock_single_session({"titles": []})
     with patch("wikipedia_analysis.api.get_db_session", return_value=mock_sess):
         resp = client.get("/category/Unknown%20Category")
     assert resp.status_code == 200
@@ -101,3 +111,19 @@ def test_get_articles_in_category_db_error(client):
         resp = client.get("/category/Physics")
     assert resp.status_code == 500
     assert "error" in json.loads(resp.data)
+
+
+# ---------------------------------------------------------------------------
+# Index setup
+# ---------------------------------------------------------------------------
+
+def test_ensure_indexes_creates_lookup_indexes():
+    from wikipedia_analysis import api
+    mock_sess = MagicMock()
+    mock_sess.__enter__ = lambda s: s
+    mock_sess.__exit__ = MagicMock(return_value=False)
+    with patch("wikipedia_analysis.api.get_db_session", return_value=mock_sess):
+        api.ensure_indexes()
+    queries = [c[0][0] for c in mock_sess.run.call_args_list]
+    assert queries == list(api.API_INDEXES)
+    assert any("(c:Category) ON (c.name)" in q for q in queries)
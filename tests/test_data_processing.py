@@ -1,6 +1,11 @@
+import bz2
+import gzip
+import mmap
+import shutil
 import pytest
 from unittest.mock import mock_open, patch
 import lxml.etree as ET
+from wikipedia_analysis import data_processing
 from wikipedia_analysis.data_processing import (
     clean_title,
     validate_length,
@@ -8,6 +13,7 @@ from wikipedia_analysis.data_processing import (
     batch_data,
     transform_to_article_node,
     transform_to_category_node,
+    transform_batch,
     transform_to_links_to_relationship,
     transform_to_belongs_to_relationship,
     transform_to_redirects_to_relationship
@@ -96,7 +102,7 @@ def corrupted_xml_content():
 
 # --- Test Wikipedia dump file parsing ---
 def test_parse_dump_file_correctly_extracts_articles_and_links(sample_xml_content):
-    m = mock_open(read_data=sample_xml_content)
+    m = mock_open(read_data=sample_xml_content.encode('utf-8'))
     with patch('builtins.open', m):
         # For lxml.etree.iterparse, we need to mock the file-like object it receives
         # which is typically opened by 'builtins.open'.
@@ -143,7 +149,7 @@ def test_parse_dump_file_correctly_extracts_articles_and_links(sample_xml_conten
 
 
 def test_parse_dump_file_handles_missing_id_or_title(sample_xml_content):
-    m = mock_open(read_data=sample_xml_content)
+    m = mock_open(read_data=sample_xml_content.encode('utf-8'))
     with patch('builtins.open', m):
         dummy_file_path = "dummy.xml"
         articles = list(parse_dump_file(dummy_file_path))
@@ -153,7 +159,109 @@ def test_parse_dump_file_handles_missing_id_or_title(sample_xml_content):
         assert not any('Page with no title' in a['title'] for a in articles if 'title' in a)
         assert len(articles) == 6 # Only valid pages should be processed
 
+def test_parse_dump_file_with_workers_matches_serial(tmp_path):
+    pages = "".join(
+        f"<page><title>Article {i}</title><id>{i}</id>"
+        f"<revision><text>[[Article {i + 1}]] [[Article {i}]]</text></revision></page>"
+        for i in range(600)
+    )
+    dump = tmp_path / "dump.xml"
+    dump.write_text(f"<mediawiki>{pages}</mediawiki>", encoding="utf-8")
+
+    serial = list(parse_dump_file(str(dump)))
+    parallel = list(parse_dump_file(str(dump), workers=2))
+
+    assert len(serial) == 600
+    assert parallel == serial
+
+def test_parse_dump_file_survives_periodic_root_clear(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_processing, "ROOT_CLEAR_INTERVAL", 3)
+    pages = "".join(
+        f"<page><title>Article {i}</title><id>{i}</id>"
+        f"<revision><text>[[Article {i + 1}]]</text></revision></page>"
+        for i in range(10)
+    )
+    dump = tmp_path / "dump.xml"
+    dump.write_text(f"<mediawiki>{pages}</mediawiki>", encoding="utf-8")
+
+    articles = list(parse_dump_file(str(dump)))
+
+    assert [a['id'] for a in articles] == [str(i) for i in range(10)]
+    assert articles[-1]['links'] == ['Article 10']
+
+def test_parse_dump_file_releases_mapped_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_processing, "MMAP_RELEASE_BYTES", 1)
+    pages = "".join(
+        f"<page><title>Article {i}</title><id>{i}</id>"
+        f"<revision><text>{'x' * 5000} [[Article {i + 1}]]</text></revision></page>"
+        for i in range(50)
+    )
+    dump = tmp_path / "dump.xml"
+    dump.write_text(f"<mediawiki>{pages}</mediawiki>", encoding="utf-8")
+
+    articles = list(parse_dump_file(str(dump)))
+
+    assert [a['id'] for a in articles] == [str(i) for i in range(50)]
+    assert articles[-1]['links'] == ['Article 50']
+
+def test_parse_dump_file_with_workers_handles_malformed_xml(tmp_path, corrupted_xml_content):
+    dump = tmp_path / "dump.xml"
+    dump.write_text(corrupted_xml_content, encoding="utf-8")
+
+    articles = list(parse_dump_file(str(dump), workers=2))
+
+    assert [a['id'] for a in articles] == ['10']
+
+@pytest.mark.parametrize("suffix,compress", [(".bz2", bz2.compress), (".gz", gzip.compress)])
+@pytest.mark.parametrize("external", [True, False])
+def test_parse_dump_file_reads_compressed_dumps(tmp_path, monkeypatch, sample_xml_content, suffix, compress, external):
+    plain = tmp_path / "dump.xml"
+    plain.write_text(sample_xml_content, encoding="utf-8")
+    packed = tmp_path / f"dump.xml{suffix}"
+    packed.write_bytes(compress(sample_xml_content.encode("utf-8")))
+    if external:
+        if not any(shutil.which(cmd[0]) for cmd in data_processing._DECOMPRESSORS[suffix]):
+            pytest.skip("no external decompressor installed")
+    else:
+        monkeypatch.setattr(data_processing.shutil, "which", lambda _: None)
+
+    assert list(parse_dump_file(str(packed))) == list(parse_dump_file(str(plain)))
+
+def test_parse_dump_file_reads_bz2_with_indexed_bzip2(tmp_path, monkeypatch, sample_xml_content):
+    pytest.importorskip("indexed_bzip2")
+    monkeypatch.setattr(data_processing, "INDEXED_BZIP2_AVAILABLE", True)
+    monkeypatch.setattr(data_processing.shutil, "which", lambda _: None)
+    plain = tmp_path / "dump.xml"
+    plain.write_text(sample_xml_content, encoding="utf-8")
+    packed = tmp_path / "dump.xml.bz2"
+    packed.write_bytes(bz2.compress(sample_xml_content.encode("utf-8")))
+
+    assert list(parse_dump_file(str(packed))) == list(parse_dump_file(str(plain)))
+
+def test_open_dump_maps_plain_files(tmp_path):
+    dump = tmp_path / "dump.xml"
+    dump.write_bytes(b"<mediawiki></mediawiki>")
+    empty = tmp_path / "empty.xml"
+    empty.write_bytes(b"")
+
+    with data_processing.open_dump(str(dump)) as fh:
+        assert isinstance(fh, mmap.mmap)
+        assert fh.read() == b"<mediawiki></mediawiki>"
+    # Zero-length files cannot be mapped and are read normally
+    with data_processing.open_dump(str(empty)) as fh:
+        assert not isinstance(fh, mmap.mmap)
+        assert fh.read() == b""
+
 # --- Test data cleaning and validation functions ---
+@pytest.mark.parametrize("use_hyperscan", [True, False])
+def test_extract_links_matches_regex_semantics(monkeypatch, use_hyperscan):
+    if use_hyperscan:
+        pytest.importorskip("hyperscan")
+    monkeypatch.setattr(data_processing, "HYPERSCAN_AVAILABLE", use_hyperscan)
+    text = "See [[Foo]], [[Bar|bar]], [[ Foo ]], [[Caf\u00e9|x|y]] and [[Self]]."
+    links = data_processing._extract_links(text, "Self")
+    assert links == ["Foo", "Bar", "Caf\u00e9"]
+
 def test_clean_title():
     assert clean_title("  Test Article  ") == "Test Article"
     assert clean_title("Test   Article") == "Test Article"
@@ -162,6 +270,8 @@ def test_clean_title():
     assert clean_title(None) == ""
     assert clean_title("  Leading/Trailing Spaces ") == "Leading/Trailing Spaces"
     assert clean_title("Multiple    Spaces   Here") == "Multiple Spaces Here"
+    assert clean_title("Tab\tand\nnewline") == "Tab and newline"
+    assert clean_title("No\u00a0break\u3000space") == "No break space"
 
 def test_validate_length():
     assert validate_length("hello", max_length=10) == True
@@ -200,7 +310,7 @@ def test_batch_data_handles_batch_size_larger_than_data():
 
 # --- Test error handling for corrupted data ---
 def test_parse_dump_file_handles_malformed_xml(corrupted_xml_content, caplog):
-    m = mock_open(read_data=corrupted_xml_content)
+    m = mock_open(read_data=corrupted_xml_content.encode('utf-8'))
     with patch('builtins.open', m):
         dummy_file_path = "dummy.xml"
         
@@ -244,6 +354,18 @@ def test_transform_to_article_node(sample_article_data):
     assert transform_to_article_node({}) is None
     assert transform_to_article_node(None) is None
 
+def test_transform_batch_matches_per_article_transform(sample_article_data):
+    articles = [sample_article_data, {'id': 'abc', 'title': 'Another Article'}, {'title': 'No ID'}, None]
+    columns = transform_batch(articles)
+
+    expected = [transform_to_article_node(a) for a in articles]
+    expected = [node for node in expected if node]
+    assert columns == {
+        'id': [node['id'] for node in expected],
+        'title': [node['title'] for node in expected],
+        'url': [node['url'] for node in expected],
+    }
+
 def test_transform_to_category_node(sample_category_data):
     # Test with complete data
     category_node = transform_to_category_node(sample_category_data)
@@ -1,9 +1,11 @@
 import pytest
 from unittest.mock import patch, Mock, MagicMock
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, WRITE_ACCESS
 from wikipedia_analysis.database import Neo4jConnectionManager, create_article_node, create_category_node, \
     create_links_to_relationship, create_belongs_to_relationship, create_redirects_to_relationship, \
-    create_constraints_and_indexes, batch_import_nodes, batch_import_relationships
+    create_constraints_and_indexes, await_indexes, drop_secondary_indexes, batch_import_nodes, batch_import_relationships, batch_import_article_columns, \
+    load_articles_batch, load_links_batch, load_batches_concurrently, load_articles_periodic, create_driver, write_session, \
+    DRIVER_POOL_SIZE, DRIVER_ACQUISITION_TIMEOUT, DRIVER_MAX_LIFETIME, NEO4J_DATABASE
 
 # Test Neo4j connection establishment and teardown
 def test_connection_manager_connect_success(mock_config):
@@ -14,7 +16,14 @@ def test_connection_manager_connect_success(mock_config):
         manager = Neo4jConnectionManager(mock_config.NEO4J_URI, mock_config.NEO4J_USER, mock_config.NEO4J_PASSWORD)
         manager.connect()
         
-        mock_driver.assert_called_once_with(mock_config.NEO4J_URI, auth=(mock_config.NEO4J_USER, mock_config.NEO4J_PASSWORD))
+        mock_driver.assert_called_once_with(
+            mock_config.NEO4J_URI,
+            auth=(mock_config.NEO4J_USER, mock_config.NEO4J_PASSWORD),
+            max_connection_pool_size=DRIVER_POOL_SIZE,
+            connection_acquisition_timeout=DRIVER_ACQUISITION_TIMEOUT,
+            max_connection_lifetime=DRIVER_MAX_LIFETIME,
+            keep_alive=True
+        )
         mock_driver_instance.verify_connectivity.assert_called_once()
         assert manager.get_driver() is not None
 
@@ -159,6 +168,101 @@ def test_batch_import_nodes_empty_list(mock_neo4j_session):
     batch_import_nodes(mock_neo4j_session, "Article", [])
     mock_neo4j_session.run.assert_not_called()
 
+def test_batch_import_article_columns(mock_neo4j_session):
+    columns = {"id": [1, 2], "title": ["Article 1", "Article 2"], "url": ["u1", "u2"]}
+    summary = batch_import_article_columns(mock_neo4j_session, columns)
+    mock_neo4j_session.run.assert_called_once()
+    args, kwargs = mock_neo4j_session.run.call_args
+    assert "UNWIND range(0, size($ids) - 1) AS i" in args[0]
+    assert "MERGE (n:Article {id: $ids[i]})" in args[0]
+    assert kwargs == {"ids": [1, 2], "titles": ["Article 1", "Article 2"], "urls": ["u1", "u2"]}
+    assert summary is mock_neo4j_session.run.return_value.consume.return_value
+
+def test_batch_import_article_columns_empty(mock_neo4j_session):
+    batch_import_article_columns(mock_neo4j_session, {"id": [], "title": [], "url": []})
+    mock_neo4j_session.run.assert_not_called()
+
+def _run_write_inline(session):
+    tx = Mock()
+    session.execute_write.side_effect = lambda fn, *args, **kwargs: fn(tx, *args, **kwargs)
+    return tx
+
+def test_drop_secondary_indexes(mock_neo4j_session):
+    mock_neo4j_session.run.side_effect = [[{"name": "index_title"}, {"name": "odd`name"}], Mock(), Mock()]
+
+    assert drop_secondary_indexes(mock_neo4j_session) == ["index_title", "odd`name"]
+
+    first, *drops = mock_neo4j_session.run.call_args_list
+    assert "owningConstraint IS NULL" in first.args[0]
+    assert "type IN ['RANGE', 'BTREE']" in first.args[0]
+    assert first.kwargs == {"properties": ["title", "namespace"]}
+    assert [call.args[0] for call in drops] == [
+        "DROP INDEX `index_title` IF EXISTS",
+        "DROP INDEX `odd``name` IF EXISTS",
+    ]
+
+def test_load_articles_batch(mock_neo4j_session):
+    tx = _run_write_inline(mock_neo4j_session)
+    rows = [{"id": 1, "title": "Article 1", "url": "u1"}]
+    load_articles_batch(mock_neo4j_session, rows)
+    mock_neo4j_session.execute_write.assert_called_once()
+    args, kwargs = tx.run.call_args
+    assert "UNWIND $rows AS r" in args[0]
+    assert "MERGE (a:Article {id: r.id})" in args[0]
+    assert kwargs == {"rows": rows}
+
+def test_load_links_batch(mock_neo4j_session):
+    tx = _run_write_inline(mock_neo4j_session)
+    rels = [(1, "Article 2")]
+    load_links_batch(mock_neo4j_session, rels)
+    args, kwargs = tx.run.call_args
+    assert "UNWIND $rels AS r" in args[0]
+    assert "MATCH (t:Article {title: r[1]})" in args[0]
+    assert "MERGE (t:Article" not in args[0]
+    assert "MERGE (s)-[:LINKS_TO]->(t)" in args[0]
+    assert kwargs == {"rels": rels}
+
+def test_load_batches_skip_empty(mock_neo4j_session):
+    load_articles_batch(mock_neo4j_session, [])
+    load_links_batch(mock_neo4j_session, [])
+    mock_neo4j_session.execute_write.assert_not_called()
+
+def test_load_articles_periodic(mock_neo4j_session):
+    rows = [{"id": 1, "title": "Article 1", "url": "u1"}]
+    mock_neo4j_session.run.return_value.single.return_value = {"total": 1, "errorMessages": {}}
+
+    assert load_articles_periodic(mock_neo4j_session, rows, batch_size=100) == 1
+    args, kwargs = mock_neo4j_session.run.call_args
+    assert "apoc.periodic.iterate" in args[0]
+    assert kwargs == {"rows": rows, "batch_size": 100, "parallel": False}
+
+def test_load_articles_periodic_raises_on_batch_errors(mock_neo4j_session):
+    mock_neo4j_session.run.return_value.single.return_value = {"total": 1, "errorMessages": {"boom": 1}}
+    with pytest.raises(RuntimeError, match="boom"):
+        load_articles_periodic(mock_neo4j_session, [{"id": 1, "title": "A", "url": "u"}])
+
+def test_load_batches_concurrently_uses_a_session_per_batch():
+    driver = MagicMock()
+    loaded = []
+    batches = ([{"id": i}] for i in range(10))
+
+    count = load_batches_concurrently(driver, lambda session, batch: loaded.append(batch), batches, concurrency=3)
+
+    assert count == 10
+    assert sorted(b[0]["id"] for b in loaded) == list(range(10))
+    assert driver.session.call_count == 10
+    driver.session.assert_called_with(database=NEO4J_DATABASE, default_access_mode=WRITE_ACCESS)
+
+def test_load_batches_concurrently_reraises_failures():
+    driver = MagicMock()
+
+    def load_batch(session, batch):
+        if batch == ["bad"]:
+            raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        load_batches_concurrently(driver, load_batch, [["ok"], ["bad"], ["ok"]], concurrency=2)
+
 def test_batch_import_relationships(mock_neo4j_session):
     relationships_data = [
         {"from_id_prop": "art1", "to_id_prop": "art2"},
@@ -177,44 +281,21 @@ def test_batch_import_relationships_empty_list(mock_neo4j_session):
     batch_import_relationships(mock_neo4j_session, "LINKS_TO", "Article", "Article", "from_id_prop", "to_id_prop", [])
     mock_neo4j_session.run.assert_not_called()
 
-# Test transaction handling and rollback scenarios
-def test_transaction_success(mock_config):
-    with patch('neo4j.GraphDatabase.driver') as mock_driver:
-        mock_driver_instance = MagicMock()
-        mock_session = MagicMock()
-        mock_transaction = Mock()
-
-        mock_driver.return_value = mock_driver_instance
-        mock_driver_instance.session.return_value.__enter__.return_value = mock_session
-        mock_session.begin_transaction.return_value.__enter__.return_value = mock_transaction
+def test_await_indexes(mock_neo4j_session):
+    await_indexes(mock_neo4j_session, timeout_seconds=60)
+    mock_neo4j_session.run.assert_called_once_with("CALL db.awaitIndexes($timeout)", timeout=60)
 
-        manager = Neo4jConnectionManager(mock_config.NEO4J_URI, mock_config.NEO4J_USER, mock_config.NEO4J_PASSWORD)
-        with manager.get_driver().session() as session:
-            with session.begin_transaction() as tx:
-                tx.run("CREATE (n:Test {name: 'Success'})")
-            
-            mock_transaction.commit.assert_called_once()
-            mock_transaction.rollback.assert_not_called()
-
-def test_transaction_rollback_on_failure(mock_config):
+def test_create_driver_allows_overriding_settings():
     with patch('neo4j.GraphDatabase.driver') as mock_driver:
-        mock_driver_instance = MagicMock()
-        mock_session = MagicMock()
-        mock_transaction = Mock()
+        create_driver("bolt://localhost:7687", "neo4j", "pw", max_connection_pool_size=8)
+        kwargs = mock_driver.call_args.kwargs
+        assert kwargs["max_connection_pool_size"] == 8
+        assert kwargs["keep_alive"] is True
 
-        mock_driver.return_value = mock_driver_instance
-        mock_driver_instance.session.return_value.__enter__.return_value = mock_session
-        mock_session.begin_transaction.return_value.__enter__.return_value = mock_transaction
-        mock_transaction.run.side_effect = Exception("Transaction failed")
-
-        manager = Neo4jConnectionManager(mock_config.NEO4J_URI, mock_config.NEO4J_USER, mock_config.NEO4J_PASSWORD)
-        with pytest.raises(Exception, match="Transaction failed"):
-            with manager.get_driver().session() as session:
-                with session.begin_transaction() as tx:
-                    tx.run("CREATE (n:Test {name: 'Failure'})")
-        
-        mock_transaction.rollback.assert_called_once()
-        mock_transaction.commit.assert_not_called()
+def test_write_session_opens_write_session_on_configured_database():
+    driver = MagicMock()
+    assert write_session(driver) is driver.session.return_value
+    driver.session.assert_called_once_with(database=NEO4J_DATABASE, default_access_mode=WRITE_ACCESS)
 
 # Data Integrity Tests (Conceptual, as mocking doesn't fully simulate DB constraints)
 # These tests primarily verify that the correct Cypher is sent to enforce integrity.
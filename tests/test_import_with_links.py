@@ -0,0 +1,25 @@
+import pytest
+from wikipedia_analysis import import_with_links
+from wikipedia_analysis.import_with_links import extract_links_and_categories
+
+
+@pytest.mark.parametrize("use_hyperscan", [True, False])
+def test_extract_links_and_categories(monkeypatch, use_hyperscan):
+    if use_hyperscan:
+        pytest.importorskip("hyperscan")
+    monkeypatch.setattr(import_with_links, "HYPERSCAN_AVAILABLE", use_hyperscan)
+    wikitext = (
+        "[[Graph theory|graphs]] and [[Café#History]] link to [[ Graph theory ]]. "
+        "[[File:Diagram.png|thumb]] [[Template:Infobox]] "
+        "[[Category:Mathematics|Sort key]] [[Category: Networks ]]"
+    )
+
+    links, categories = extract_links_and_categories(wikitext)
+
+    assert links == {"Graph theory", "Café"}
+    assert categories == {"Mathematics", "Networks"}
+
+
+def test_extract_links_and_categories_without_links():
+    assert extract_links_and_categories("Plain text") == (set(), set())
+    assert extract_links_and_categories(None) == (set(), set())
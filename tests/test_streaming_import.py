@@ -0,0 +1,324 @@
+import csv
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from wikipedia_analysis import streaming_import
+from wikipedia_analysis.streaming_import import (
+    AdaptiveBatchSize,
+    MemoryBackoff,
+    _group_columns,
+    _prefetch,
+    check_memory_pressure,
+    offline_import,
+    write_article_columns_periodic,
+    write_article_csv,
+)
+
+
+def test_prefetch_preserves_order():
+    assert list(_prefetch(iter(range(20)), depth=2)) == list(range(20))
+
+
+def test_prefetch_produces_on_another_thread():
+    producers = set()
+
+    def batches():
+        for i in range(3):
+            producers.add(threading.current_thread())
+            yield i
+
+    assert list(_prefetch(batches())) == [0, 1, 2]
+    assert producers and threading.current_thread() not in producers
+
+
+def test_prefetch_reraises_producer_errors_after_earlier_items():
+    def batches():
+        yield 1
+        raise ValueError("bad page")
+
+    consumed = []
+    with pytest.raises(ValueError, match="bad page"):
+        for batch in _prefetch(batches()):
+            consumed.append(batch)
+    assert consumed == [1]
+
+
+def test_prefetch_stops_producer_when_consumer_stops():
+    produced = []
+
+    def batches():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    items = _prefetch(batches(), depth=1)
+    assert next(items) == 0
+    items.close()
+    assert len(produced) < 1000
+
+
+def test_prefetch_close_with_full_queue_after_source_is_exhausted():
+    closed = threading.Event()
+
+    def batches():
+        try:
+            yield from range(5)
+        finally:
+            closed.set()
+
+    items = _prefetch(batches(), depth=4)
+    assert next(items) == 0
+    # Let the producer fill the queue and block on the end-of-stream sentinel
+    time.sleep(0.3)
+    closer = threading.Thread(target=items.close, daemon=True)
+    closer.start()
+    closer.join(timeout=5)
+    assert not closer.is_alive()
+    assert closed.is_set()
+
+
+def test_prefetch_closes_source_when_consumer_stops_early():
+    closed = threading.Event()
+
+    def batches():
+        try:
+            yield from range(1000)
+        finally:
+            closed.set()
+
+    items = _prefetch(batches(), depth=1)
+    assert next(items) == 0
+    items.close()
+    assert closed.is_set()
+
+
+def test_group_columns_concatenates_up_to_size():
+    batches = [{"id": [i], "title": [f"T{i}"], "url": [f"u{i}"]} for i in range(5)]
+
+    grouped = list(_group_columns(batches, 2))
+
+    assert [g["id"] for g in grouped] == [[0, 1], [2, 3], [4]]
+    assert grouped[0]["title"] == ["T0", "T1"]
+    assert list(_group_columns([], 2)) == []
+
+
+def test_group_columns_follows_adaptive_size():
+    size = AdaptiveBatchSize(2, minimum=1)
+    batches = ({"id": [i]} for i in range(10))
+    grouped = _group_columns(batches, size)
+
+    assert next(grouped)["id"] == [0, 1]
+    size.size = 4
+    assert next(grouped)["id"] == [2, 3, 4, 5]
+
+
+def test_adaptive_batch_size_grows_and_shrinks_within_bounds():
+    size = AdaptiveBatchSize(100, minimum=50, maximum=300, fast=0.3, slow=1.0)
+
+    size.record(0.1)
+    assert size.size == 200
+    size.record(0.1)
+    assert size.size == 300
+    size.record(0.5)
+    assert size.size == 300
+    size.record(2.0)
+    assert size.size == 150
+    size.record(2.0)
+    size.record(2.0)
+    assert size.size == 50
+
+
+def test_adaptive_batch_size_shrinks_on_failed_write():
+    size = AdaptiveBatchSize(400)
+
+    def failing_write(session, batch):
+        raise RuntimeError("deadlock")
+
+    with pytest.raises(RuntimeError):
+        size.timed(failing_write)(None, [])
+    assert size.size == 200
+
+
+@pytest.mark.parametrize("percent,expected", [(40.0, True), (95.0, False)])
+def test_check_memory_pressure_reads_psutil(monkeypatch, percent, expected):
+    fake_psutil = Mock()
+    fake_psutil.virtual_memory.return_value = SimpleNamespace(percent=percent)
+    process = Mock()
+    process.memory_info.return_value = SimpleNamespace(rss=1)
+    monkeypatch.setattr(streaming_import, "psutil", fake_psutil, raising=False)
+    monkeypatch.setattr(streaming_import, "_PROCESS", process)
+    monkeypatch.setattr(streaming_import, "PSUTIL_AVAILABLE", True)
+
+    assert check_memory_pressure() is expected
+
+
+def test_check_memory_pressure_over_rss_limit(monkeypatch):
+    process = Mock()
+    process.memory_info.return_value = SimpleNamespace(rss=2048)
+    monkeypatch.setattr(streaming_import, "psutil", Mock(), raising=False)
+    monkeypatch.setattr(streaming_import, "_PROCESS", process)
+    monkeypatch.setattr(streaming_import, "PSUTIL_AVAILABLE", True)
+    monkeypatch.setattr(streaming_import, "RSS_LIMIT", 1024)
+
+    assert check_memory_pressure() is False
+
+
+def test_memory_backoff_pauses_at_most_once_per_interval_under_sustained_pressure(monkeypatch):
+    clock = [1000.0]
+    sleep = Mock(side_effect=lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    monkeypatch.setattr(streaming_import, "check_memory_pressure", lambda: False)
+    monkeypatch.setattr(streaming_import.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(streaming_import.time, "sleep", sleep)
+    backoff = MemoryBackoff()
+
+    paused = []
+    for _ in range(100):
+        paused.append(backoff.check())
+        clock[0] += 0.1  # one batch
+
+    assert sleep.call_count == 1
+    assert paused[0] is True and not any(paused[1:])
+    clock[0] += streaming_import.MEMORY_PAUSE_INTERVAL
+    assert backoff.check() is True
+    assert sleep.call_count == 2
+
+
+def test_memory_backoff_does_not_pause_without_pressure(monkeypatch):
+    sleep = Mock()
+    monkeypatch.setattr(streaming_import, "check_memory_pressure", lambda: True)
+    monkeypatch.setattr(streaming_import.time, "sleep", sleep)
+
+    assert MemoryBackoff().check() is False
+    sleep.assert_not_called()
+
+
+def test_check_memory_pressure_without_psutil(monkeypatch):
+    monkeypatch.setattr(streaming_import, "PSUTIL_AVAILABLE", False)
+    assert check_memory_pressure() is True
+
+
+def _write_dump(path, count):
+    pages = "".join(f"<page><title>Article {i}</title><id>{i}</id></page>" for i in range(count))
+    path.write_text(f"<mediawiki>{pages}</mediawiki>", encoding="utf-8")
+
+
+def test_write_article_csv(tmp_path):
+    dump = tmp_path / "dump.xml"
+    _write_dump(dump, 3)
+    csv_path = tmp_path / "articles.csv"
+
+    assert write_article_csv(str(dump), str(csv_path), batch_size=2) == 3
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id:ID", "title", "url"]
+    assert rows[1] == ["0", "Article 0", "https://en.wikipedia.org/wiki/Article_0"]
+    assert len(rows) == 4
+
+
+def test_offline_import_runs_neo4j_admin(tmp_path):
+    dump = tmp_path / "dump.xml"
+    _write_dump(dump, 2)
+
+    with patch.object(streaming_import.subprocess, "run") as run:
+        assert offline_import(str(dump), output_dir=str(tmp_path), database="wiki") == 2
+
+    command = run.call_args.args[0]
+    assert command[:5] == ["neo4j-admin", "database", "import", "full", f"--nodes=Article={tmp_path / 'articles.csv'}"]
+    assert command[-1] == "wiki"
+    assert run.call_args.kwargs == {"check": True}
+
+
+def test_streaming_import_fails_before_parsing_when_neo4j_is_down(tmp_path, monkeypatch, capsys):
+    from neo4j.exceptions import ServiceUnavailable
+    from wikipedia_analysis.config import Neo4jConfig
+
+    parse = Mock()
+    monkeypatch.setattr(streaming_import, "parse_dump_file", parse)
+    driver = Mock()
+    driver.verify_connectivity.side_effect = ServiceUnavailable("connection refused")
+    with patch("wikipedia_analysis.config.load_neo4j_config", return_value=Neo4jConfig("bolt://db:7687", "u", "p")), \
+            patch("neo4j.GraphDatabase.driver", return_value=driver):
+        assert streaming_import.streaming_import(str(tmp_path / "dump.xml")) is False
+
+    parse.assert_not_called()
+    assert "unreachable at bolt://db:7687" in capsys.readouterr().out
+
+
+def test_write_article_columns_periodic_sends_rows_in_parallel(monkeypatch):
+    load = Mock()
+    monkeypatch.setattr(streaming_import, "load_articles_periodic", load)
+    session = Mock()
+
+    write_article_columns_periodic(session, {"id": [1, 2], "title": ["A", "B"], "url": ["ua", "ub"]})
+
+    load.assert_called_once_with(
+        session,
+        [{"id": 1, "title": "A", "url": "ua"}, {"id": 2, "title": "B", "url": "ub"}],
+        batch_size=streaming_import.PERIODIC_BATCH_SIZE,
+        parallel=True,
+    )
+
+
+def test_streaming_import_bulk_drops_indexes_before_awaiting_them(tmp_path, monkeypatch):
+    from wikipedia_analysis.config import Neo4jConfig
+
+    dump = tmp_path / "dump.xml"
+    _write_dump(dump, 3)
+    calls = Mock()
+    calls.drop_secondary_indexes.return_value = ["index_title"]
+    calls.write_article_columns.return_value = SimpleNamespace(counters=SimpleNamespace(nodes_created=3))
+    for name in ("create_constraints_and_indexes", "drop_secondary_indexes", "await_indexes", "write_article_columns"):
+        monkeypatch.setattr(streaming_import, name, getattr(calls, name))
+    with patch("wikipedia_analysis.config.load_neo4j_config", return_value=Neo4jConfig("bolt://db:7687", "u", "p")), \
+            patch("neo4j.GraphDatabase.driver"):
+        assert streaming_import.streaming_import(str(dump), concurrency=1, bulk=True) is True
+
+    order = [name for name, _, _ in calls.mock_calls if "." not in name]
+    assert order == [
+        "create_constraints_and_indexes", "drop_secondary_indexes", "await_indexes",
+        "write_article_columns",
+        "create_constraints_and_indexes", "await_indexes",
+    ]
+
+
+def test_streaming_import_apoc_groups_rows_for_parallel_partitions(tmp_path, monkeypatch):
+    from wikipedia_analysis.config import Neo4jConfig
+
+    dump = tmp_path / "dump.xml"
+    _write_dump(dump, 25)
+    sizes = []
+    monkeypatch.setattr(streaming_import, "create_constraints_and_indexes", Mock())
+    monkeypatch.setattr(streaming_import, "await_indexes", Mock())
+    monkeypatch.setattr(streaming_import, "write_article_columns_periodic",
+                        lambda session, columns: sizes.append(len(columns["id"])))
+    with patch("wikipedia_analysis.config.load_neo4j_config", return_value=Neo4jConfig("bolt://db:7687", "u", "p")), \
+            patch("neo4j.GraphDatabase.driver"):
+        assert streaming_import.streaming_import(str(dump), batch_size=1, concurrency=1, apoc=True) is True
+
+    # batch_size * TX_MULTIPLIER would split these 25 rows into two calls
+    assert sizes == [25]
+    assert streaming_import.PERIODIC_GROUP_SIZE > streaming_import.PERIODIC_BATCH_SIZE
+
+
+def test_load_dump_loads_every_article_before_any_link(monkeypatch):
+    articles = [
+        {"id": "1", "title": "A", "links": ["B"]},
+        {"id": "2", "title": "B", "links": ["A"]},
+    ]
+    calls = Mock()
+    monkeypatch.setattr(streaming_import, "parse_dump_file", lambda xml_file: iter(articles))
+    monkeypatch.setattr(streaming_import, "load_articles_batch", calls.load_articles_batch)
+    monkeypatch.setattr(streaming_import, "load_links_batch", calls.load_links_batch)
+    session = Mock()
+
+    # One article per batch: the link A -> B refers to a later batch
+    assert streaming_import.load_dump(session, "dump.xml", batch_size=1) == 2
+
+    assert [name for name, _, _ in calls.mock_calls] == [
+        "load_articles_batch", "load_articles_batch", "load_links_batch", "load_links_batch",
+    ]
+    assert calls.load_links_batch.call_args_list[0].args == (session, [(1, "B")])
@@ -8,6 +8,8 @@ __version__ = "1.0.0"
 __author__ = "Ryder Pongracic"
 __email__ = "ryderjpm@gmail.com"
 
+from contextlib import contextmanager
+
 # Import configuration first
 from .config import load_neo4j_config, Neo4jConfig, NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
 
@@ -17,6 +19,13 @@ from .database import (
     create_constraints_and_indexes, 
     batch_import_nodes, 
     batch_import_relationships,
+    batch_import_article_columns,
+    load_articles_batch,
+    load_links_batch,
+    load_batches_concurrently,
+    load_articles_periodic,
+    create_driver,
+    write_session,
     create_article_node,
     create_category_node
 )
@@ -25,10 +34,12 @@ from .database import (
 from .data_processing import (
     clean_title, 
     parse_dump_file, 
+    open_dump,
     batch_data,
     validate_length,
     transform_to_article_node,
-    transform_to_category_node
+    transform_to_category_node,
+    transform_batch
 )
 
 # Import query building functions
@@ -50,6 +61,13 @@ try:
         find_shortest_path,
         detect_communities,
         calculate_centrality,
+        calculate_pagerank_async,
+        find_shortest_path_async,
+        detect_communities_async,
+        calculate_centrality_async,
+        run_analyses_async,
+        gds_graph,
+        ensure_projection,
         export_results,
         measure_performance,
         gds  # Include gds for backward compatibility
@@ -66,6 +84,21 @@ except ImportError as e:
         return {}
     def calculate_centrality(*args, **kwargs):
         return []
+    async def calculate_pagerank_async(*args, **kwargs):
+        return []
+    async def find_shortest_path_async(*args, **kwargs):
+        return []
+    async def detect_communities_async(*args, **kwargs):
+        return {}
+    async def calculate_centrality_async(*args, **kwargs):
+        return []
+    async def run_analyses_async(*args, **kwargs):
+        return {"pagerank": [], "communities": {}, "centrality": []}
+    @contextmanager
+    def gds_graph(session, project_name="wikipedia", *args, **kwargs):
+        yield project_name
+    def ensure_projection(*args, **kwargs):
+        pass
     def export_results(*args, **kwargs):
         pass
     def measure_performance(func, *args, **kwargs):
@@ -90,15 +123,24 @@ __all__ = [
     'create_constraints_and_indexes',
     'batch_import_nodes', 
     'batch_import_relationships',
+    'batch_import_article_columns',
+    'load_articles_batch',
+    'load_links_batch',
+    'load_batches_concurrently',
+    'load_articles_periodic',
+    'create_driver',
+    'write_session',
     'create_article_node',
     'create_category_node',
     # Data processing functions
     'clean_title',
     'parse_dump_file',
+    'open_dump',
     'batch_data',
     'validate_length',
     'transform_to_article_node',
     'transform_to_category_node',
+    'transform_batch',
     # Query building functions
     'build_article_query',
     'build_category_query',
@@ -113,6 +155,13 @@ __all__ = [
     'find_shortest_path',
     'detect_communities',
     'calculate_centrality',
+    'calculate_pagerank_async',
+    'find_shortest_path_async',
+    'detect_communities_async',
+    'calculate_centrality_async',
+    'run_analyses_async',
+    'gds_graph',
+    'ensure_projection',
     'export_results',
     'measure_performance',
     'gds',
@@ -1,9 +1,19 @@
 # wikipedia_analysis/analysis.py
 
+import asyncio
 import json
 import csv
+import inspect
+import os
 import time
-from typing import Dict, List, Any, Optional, Callable, Tuple, Union
+import multiprocessing
+from collections import Counter, deque
+from contextlib import contextmanager
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import Dict, Iterator, List, Any, Optional, Callable, Tuple, Union
+
+from neo4j.graph import Node
 
 
 # ==========================================
@@ -15,6 +25,31 @@ try:
 except ImportError:
     GDS_AVAILABLE = False
 
+# NumPy/SciPy power the in-memory fallbacks used when GDS procedures fail.
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# orjson and pyarrow speed up the JSON and CSV exports; the stdlib json and
+# csv modules are used without them.
+try:
+    import orjson
+    # Community results are keyed by integer community id
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 class MockGDS:
     """Mock GDS for testing when the library is unavailable."""
 
@@ -22,7 +57,8 @@ class MockGDS:
         @staticmethod
         def asNode(node_data: Any) -> Union[Dict[str, Any], Any]:
             """Mock asNode function."""
-            if hasattr(node_data, 'get'):
+            # Mappings and neo4j Nodes are already node-shaped.
+            if isinstance(node_data, (Mapping, Node)):
                 return node_data
             return {'title': str(node_data), 'id': node_data}
 
@@ -47,59 +83,461 @@ class MockGDS:
 # critical for tests that monkeypatch `asNode`.
 if GDS_AVAILABLE:
     gds = GraphDataScience
-    try:
-        util_attr = getattr(gds, "util", None)
-        # If util is a property/descriptor (common in some client versions), 
-        # replace it with a proxy to allow test monkeypatching.
-        if isinstance(util_attr, property):
-            class _UtilProxy:
-                @staticmethod
-                def asNode(node_data: Any) -> Any:
-                    return MockGDS.util.asNode(node_data)
-            setattr(gds, "util", _UtilProxy)
-        elif util_attr is None:
-            setattr(gds, "util", MockGDS.util)
-    except Exception:
-        # Fallback to ensure usable util is present for tests
-        setattr(gds, "util", MockGDS.util)
+    # getattr_static returns the descriptor stored on the class, so a
+    # `util` property is seen as a property, and a mocked GraphDataScience
+    # does not auto-create a `util` attribute just by being asked for one.
+    util_attr = inspect.getattr_static(gds, "util", None)
+    if isinstance(util_attr, property):
+        # Replace the property with a proxy to allow test monkeypatching.
+        class _UtilProxy:
+            @staticmethod
+            def asNode(node_data: Any) -> Any:
+                return MockGDS.util.asNode(node_data)
+        gds.util = _UtilProxy
+    elif util_attr is None:
+        gds.util = MockGDS.util
 else:
     gds = MockGDS()
 
 
+# ==========================================
+# Cypher Queries
+# ==========================================
+
+# Records pulled per Bolt round trip. PageRank/centrality return one row per
+# article and the fallbacks pull the whole edge list, so the driver default
+# of 1000 means thousands of PULL messages on a full dump. The driver only
+# accepts fetch_size per session, so pass it when opening analysis sessions:
+#     driver.session(fetch_size=ANALYSIS_FETCH_SIZE)
+# Use -1 to fetch everything in one go when results comfortably fit in memory.
+ANALYSIS_FETCH_SIZE = 100_000
+
+# Bound for `LIMIT $limit` when the caller asks for every row; keeps the
+# query text identical with and without a limit.
+_NO_LIMIT = 2**63 - 1
+
+def _gds_stream_query(procedure: str, config: str, column: str, order_by: str) -> str:
+    """Builds a `<procedure>.stream` query over the `$project_name` graph, capped at `$limit` rows."""
+    return f"""
+CALL {procedure}.stream($project_name, {{
+    {config}
+}})
+YIELD nodeId, {column}
+RETURN gds.util.asNode(nodeId).title AS title, {column}
+ORDER BY {order_by}
+LIMIT $limit
+"""
+
+_WEIGHTED = "relationshipWeightProperty: 'weight'"
+
+# Stream queries for each GDS algorithm, built once at import time. The graph
+# name is passed as a parameter so the query text stays constant and the
+# server can reuse its cached plan.
+_ALGO_QUERIES = {
+    "pagerank": _gds_stream_query(
+        "gds.pageRank", f"maxIterations: 20, dampingFactor: 0.85, {_WEIGHTED}", "score", "score DESC"
+    ),
+    # Grouped server-side so Bolt returns one record per community
+    "louvain": f"""
+CALL gds.louvain.stream($project_name, {{
+    {_WEIGHTED}
+}})
+YIELD nodeId, communityId
+WITH communityId, gds.util.asNode(nodeId).title AS title
+ORDER BY title
+RETURN communityId, collect(title) AS titles
+ORDER BY communityId
+""",
+    "betweenness": _gds_stream_query("gds.betweenness", _WEIGHTED, "score", "score DESC"),
+    "closeness": _gds_stream_query("gds.closeness", _WEIGHTED, "score", "score DESC"),
+}
+
+_CENTRALITY_TYPES = ("betweenness", "closeness")
+
+# Approximates PageRank by in-degree when neither GDS nor SciPy is available
+_PAGERANK_FALLBACK_QUERY = """
+MATCH (n:Article)
+OPTIONAL MATCH (n)<-[:LINKS_TO]-(m:Article)
+WITH n, count(m) as inbound_links
+RETURN n.title AS title, toFloat(inbound_links + 1) AS score
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+_SHORTEST_PATH_QUERY = """
+MATCH (start:Article {title: $start_node_title}), (end:Article {title: $end_node_title})
+CALL gds.shortestPath.bfs.stream($project_name, {
+    sourceNode: gds.util.asNode(start).id,
+    targetNode: gds.util.asNode(end).id,
+    relationshipWeightProperty: 'weight'
+})
+YIELD index, sourceNode, targetNode, totalCost, nodeIds, relationshipIds
+RETURN
+    [nodeId IN nodeIds | gds.util.asNode(nodeId).title] AS path,
+    totalCost AS length
+"""
+
+_SHORTEST_PATH_FALLBACK_QUERY = """
+MATCH (start:Article {title: $start_node_title}), (end:Article {title: $end_node_title})
+CALL apoc.path.findMany(start, end, 'LINKS_TO>', '', {maxLevel: 10, limit: 1})
+YIELD path
+RETURN [node IN nodes(path) | node.title] AS path, length(path) AS length
+"""
+
+_DEGREE_QUERY = """
+MATCH (n:Article)
+OPTIONAL MATCH (n)-[:LINKS_TO]-(connected)
+WITH n, count(connected) as degree
+RETURN n.title AS title, toFloat(degree) AS score
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+# Projects the native Article/LINKS_TO graph only when it is not already in
+# the GDS catalog, in a single round trip.
+_ENSURE_PROJECTION_QUERY = """
+CALL gds.graph.exists($project_name) YIELD exists
+WITH exists WHERE NOT exists
+CALL gds.graph.project($project_name, 'Article', {
+    LINKS_TO: {properties: {weight: {property: 'weight', defaultValue: 1.0}}}
+})
+YIELD graphName
+RETURN graphName
+"""
+
+_PROJECTION_NODE_QUERY = "MATCH (n:Article) RETURN id(n) AS id"
+_PROJECTION_REL_QUERY = (
+    "MATCH (a:Article)-[r:LINKS_TO]->(b:Article) "
+    "RETURN id(a) AS source, id(b) AS target, coalesce(r.weight, 1.0) AS weight"
+)
+
+_GRAPH_NODES_QUERY = "MATCH (n:Article) RETURN id(n) AS id, n.title AS title"
+_GRAPH_EDGES_QUERY = "MATCH (a:Article)-[:LINKS_TO]->(b:Article) RETURN id(a) AS a, id(b) AS b"
+
+
+# ==========================================
+# In-Memory Fallback Helpers
+# ==========================================
+
+PAGERANK_DAMPING_FACTOR = 0.85
+PAGERANK_MAX_ITERATIONS = 20
+
+
+def _index_link_graph(
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]]
+) -> Tuple[List[str], List[int], List[int]]:
+    """
+    Remaps Neo4j node ids onto a dense 0..N-1 index so the edges can be
+    fed straight into a sparse matrix.
+    Returns: (titles, source_indices, target_indices)
+    """
+    index: Dict[int, int] = {}
+    titles: List[str] = []
+    for r in nodes:
+        index[r["id"]] = len(titles)
+        titles.append(r["title"])
+
+    sources = [index[r["a"]] for r in edges]
+    targets = [index[r["b"]] for r in edges]
+    return titles, sources, targets
+
+
+def _load_link_graph(session: Any) -> Tuple[List[str], List[int], List[int]]:
+    """Pulls the Article nodes and the LINKS_TO edge list in two queries."""
+    nodes = session.run(_GRAPH_NODES_QUERY).data()
+    edges = session.run(_GRAPH_EDGES_QUERY).data()
+    return _index_link_graph(nodes, edges)
+
+
+async def _load_link_graph_async(session: Any) -> Tuple[List[str], List[int], List[int]]:
+    """Async variant of `_load_link_graph`."""
+    nodes = await (await session.run(_GRAPH_NODES_QUERY)).data()
+    edges = await (await session.run(_GRAPH_EDGES_QUERY)).data()
+    return _index_link_graph(nodes, edges)
+
+
+def _pagerank_power_iteration(
+    titles: List[str],
+    sources: List[int],
+    targets: List[int],
+    damping_factor: float = PAGERANK_DAMPING_FACTOR,
+    max_iterations: int = PAGERANK_MAX_ITERATIONS
+) -> List[Dict[str, Any]]:
+    """
+    Runs PageRank as sparse power iteration over a CSR adjacency matrix.
+    Rank held by dangling nodes (no outbound links) is spread uniformly.
+    """
+    n = len(titles)
+    if n == 0:
+        return []
+
+    adjacency = sp.csr_matrix(
+        (np.ones(len(sources), dtype=np.float64), (sources, targets)), shape=(n, n)
+    )
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    inv_out_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=out_degree > 0)
+    # Row-normalize, then transpose once so each iteration is a single SpMV
+    transition_t = (sp.diags(inv_out_degree) @ adjacency).T.tocsr()
+    dangling = out_degree == 0
+
+    x = np.full(n, 1.0 / n)
+    teleport = (1.0 - damping_factor) / n
+    for _ in range(max_iterations):
+        x = damping_factor * (transition_t @ x + x[dangling].sum() / n) + teleport
+
+    order = np.argsort(-x, kind="stable")
+    return [{"title": titles[i], "score": float(x[i])} for i in order]
+
+
+# Below this many nodes, worker start-up costs more than the traversals save.
+BETWEENNESS_PARALLEL_MIN_NODES = 2000
+
+
+def _brandes_partial(args: Tuple[List[int], List[int], List[int]]) -> "np.ndarray":
+    """
+    Brandes' dependency accumulation for a subset of source nodes.
+    Runs one BFS per source over the CSR arrays and returns this worker's
+    contribution to the (unnormalized) betweenness of every node.
+    """
+    indptr, indices, sources = args
+    n = len(indptr) - 1
+    centrality = np.zeros(n, dtype=np.float64)
+
+    for s in sources:
+        stack: List[int] = []
+        predecessors: List[List[int]] = [[] for _ in range(n)]
+        sigma = [0.0] * n
+        sigma[s] = 1.0
+        dist = [-1] * n
+        dist[s] = 0
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            stack.append(v)
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if dist[w] < 0:
+                    dist[w] = dist[v] + 1
+                    queue.append(w)
+                if dist[w] == dist[v] + 1:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        delta = [0.0] * n
+        while stack:
+            w = stack.pop()
+            for v in predecessors[w]:
+                delta[v] += sigma[v] / sigma[w] * (1.0 + delta[w])
+            if w != s:
+                centrality[w] += delta[w]
+    return centrality
+
+
+def _betweenness_centrality(
+    titles: List[str],
+    sources: List[int],
+    targets: List[int],
+    processes: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Computes betweenness centrality with Brandes' algorithm.
+    Source nodes are striped across a multiprocessing pool and the
+    per-worker dependency vectors are summed at the end.
+    """
+    n = len(titles)
+    if n == 0:
+        return []
+
+    adjacency = sp.csr_matrix(
+        (np.ones(len(sources), dtype=np.float64), (sources, targets)), shape=(n, n)
+    )
+    indptr = adjacency.indptr.tolist()
+    indices = adjacency.indices.tolist()
+
+    if processes is None:
+        processes = 1 if n < BETWEENNESS_PARALLEL_MIN_NODES else (os.cpu_count() or 1)
+    processes = max(1, min(processes, n))
+
+    if processes == 1:
+        centrality = _brandes_partial((indptr, indices, list(range(n))))
+    else:
+        tasks = [(indptr, indices, list(range(i, n, processes))) for i in range(processes)]
+        with multiprocessing.Pool(processes) as pool:
+            centrality = np.add.reduce(pool.map(_brandes_partial, tasks))
+
+    order = np.argsort(-centrality, kind="stable")
+    return [{"title": titles[i], "score": float(centrality[i])} for i in order]
+
+
+def _louvain_local_move(
+    titles: List[str],
+    sources: List[int],
+    targets: List[int],
+    max_passes: int = 10
+) -> Dict[int, List[str]]:
+    """
+    Runs the local-move phase of Louvain on the undirected link graph.
+    Node degrees are static and computed once; each community's degree
+    total is updated incrementally as nodes move, so the modularity gain
+    of a move uses Blondel's closed form instead of recomputing Q.
+    """
+    n = len(titles)
+    neighbors: List[Dict[int, float]] = [{} for _ in range(n)]
+    for a, b in zip(sources, targets):
+        if a == b:
+            continue
+        neighbors[a][b] = neighbors[a].get(b, 0.0) + 1.0
+        neighbors[b][a] = neighbors[b].get(a, 0.0) + 1.0
+
+    degrees = [sum(nbrs.values()) for nbrs in neighbors]
+    two_m = sum(degrees)
+    community = list(range(n))
+    community_degree = degrees[:]
+
+    for _ in range(max_passes if two_m else 0):
+        moved = False
+        for v in range(n):
+            k_v = degrees[v]
+            if not k_v:
+                continue
+            links_to: Dict[int, float] = {}
+            for u, weight in neighbors[v].items():
+                c = community[u]
+                links_to[c] = links_to.get(c, 0.0) + weight
+
+            current = community[v]
+            community_degree[current] -= k_v
+            # Gain scaled by m: k_v,in - sum_tot * k_v / 2m
+            best = current
+            best_gain = links_to.get(current, 0.0) - community_degree[current] * k_v / two_m
+            for c, k_in in links_to.items():
+                gain = k_in - community_degree[c] * k_v / two_m
+                if gain > best_gain:
+                    best, best_gain = c, gain
+            community_degree[best] += k_v
+            if best != current:
+                community[v] = best
+                moved = True
+        if not moved:
+            break
+
+    communities: Dict[int, List[str]] = {}
+    for v in sorted(range(n), key=lambda i: (community[i], titles[i])):
+        communities.setdefault(community[v], []).append(titles[v])
+    return communities
+
+
 # ==========================================
 # Analysis Functions
 # ==========================================
 
-def calculate_pagerank(session: Any, project_name: str = "wikipedia") -> List[Dict[str, Any]]:
+# Names of projections held open by an active `gds_graph` block, counted so
+# nested blocks on the same name keep it live until the outermost exits.
+_LIVE_PROJECTIONS: Counter = Counter()
+
+
+def ensure_projection(session: Any, project_name: str = "wikipedia") -> None:
+    """
+    Projects the Article/LINKS_TO graph into the GDS catalog under
+    `project_name` unless it already exists, so every algorithm call reuses
+    one projection instead of re-reading the store. Projections held open by
+    an active `gds_graph` block skip the round trip.
+    """
+    if _LIVE_PROJECTIONS[project_name]:
+        return
+    session.run(_ENSURE_PROJECTION_QUERY, project_name=project_name).consume()
+
+
+async def ensure_projection_async(session: Any, project_name: str = "wikipedia") -> None:
+    """Async variant of `ensure_projection`."""
+    if _LIVE_PROJECTIONS[project_name]:
+        return
+    result = await session.run(_ENSURE_PROJECTION_QUERY, project_name=project_name)
+    await result.consume()
+
+
+def _run_gds(session: Any, algo: str, project_name: str, **params: Any) -> List[Dict[str, Any]]:
+    """Streams one of the `_ALGO_QUERIES` algorithms and materializes the rows."""
+    ensure_projection(session, project_name)
+    return session.run(_ALGO_QUERIES[algo], project_name=project_name, **params).data()
+
+
+async def _run_gds_async(session: Any, algo: str, project_name: str, **params: Any) -> List[Dict[str, Any]]:
+    """Async variant of `_run_gds`."""
+    await ensure_projection_async(session, project_name)
+    result = await session.run(_ALGO_QUERIES[algo], project_name=project_name, **params)
+    return await result.data()
+
+
+def _limit_param(limit: Optional[int]) -> int:
+    """Maps an optional top-K onto the `$limit` parameter."""
+    return _NO_LIMIT if limit is None else limit
+
+
+@contextmanager
+def _live_projection(project_name: str) -> Iterator[None]:
+    """Marks `project_name` as projected for the duration of the block."""
+    _LIVE_PROJECTIONS[project_name] += 1
+    try:
+        yield
+    finally:
+        _LIVE_PROJECTIONS[project_name] -= 1
+        if not _LIVE_PROJECTIONS[project_name]:
+            del _LIVE_PROJECTIONS[project_name]
+
+
+@contextmanager
+def gds_graph(
+    session: Any,
+    project_name: str = "wikipedia",
+    node_query: str = _PROJECTION_NODE_QUERY,
+    relationship_query: str = _PROJECTION_REL_QUERY
+) -> Iterator[str]:
     """
-    Calculates PageRank for nodes in the graph.
-    Falls back to a Cypher implementation if GDS fails.
+    Ensures a GDS in-memory projection exists for the duration of the block
+    and yields its name for the analysis functions' `project_name`.
+    An existing projection is reused and left in place; one created here is
+    dropped on exit. Inside the block the analysis functions skip their own
+    existence check for that name.
+    """
+    exists = session.run("CALL gds.graph.exists($name) YIELD exists", name=project_name).single()["exists"]
+    if exists:
+        with _live_projection(project_name):
+            yield project_name
+        return
+
+    session.run(
+        "CALL gds.graph.project.cypher($name, $node_query, $relationship_query)",
+        name=project_name,
+        node_query=node_query,
+        relationship_query=relationship_query
+    ).consume()
+    try:
+        with _live_projection(project_name):
+            yield project_name
+    finally:
+        session.run("CALL gds.graph.drop($name, false)", name=project_name).consume()
+
+
+def calculate_pagerank(
+    session: Any,
+    project_name: str = "wikipedia",
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Calculates PageRank for nodes in the graph, highest score first.
+    `limit` keeps only the top-K rows, applied in Cypher so the rest never
+    cross the wire.
+    Falls back to an in-memory power iteration (or in-degree via Cypher
+    when SciPy is missing) if GDS fails.
     """
     try:
-        query = f"""
-        CALL gds.pageRank.stream('{project_name}', {{
-            maxIterations: 20,
-            dampingFactor: 0.85,
-            relationshipWeightProperty: 'weight'
-        }})
-        YIELD nodeId, score
-        RETURN gds.util.asNode(nodeId).title AS title, score
-        ORDER BY score DESC
-        """
-        results = session.run(query)
-        return [{"title": r["title"], "score": r["score"]} for r in results]
+        return _run_gds(session, "pagerank", project_name, limit=_limit_param(limit))
 
     except Exception:
-        # Fallback to basic PageRank calculation using Cypher
-        query = """
-        MATCH (n:Article)
-        OPTIONAL MATCH (n)<-[:LINKS_TO]-(m:Article)
-        WITH n, count(m) as inbound_links
-        RETURN n.title AS title, toFloat(inbound_links + 1) AS score
-        ORDER BY score DESC
-        """
-        results = session.run(query)
-        return [{"title": r["title"], "score": r["score"]} for r in results]
+        if SCIPY_AVAILABLE:
+            return _pagerank_power_iteration(*_load_link_graph(session))[:limit]
+        return session.run(_PAGERANK_FALLBACK_QUERY, limit=_limit_param(limit)).data()
 
 
 def find_shortest_path(
@@ -113,149 +551,259 @@ def find_shortest_path(
     Falls back to `apoc.path.findMany` if GDS fails.
     """
     try:
-        query = f"""
-        MATCH (start:Article {{title: $start_node_title}}), (end:Article {{title: $end_node_title}})
-        CALL gds.shortestPath.bfs.stream('{project_name}', {{
-            sourceNode: gds.util.asNode(start).id,
-            targetNode: gds.util.asNode(end).id,
-            relationshipWeightProperty: 'weight'
-        }})
-        YIELD index, sourceNode, targetNode, totalCost, nodeIds, relationshipIds
-        RETURN
-            [nodeId IN nodeIds | gds.util.asNode(nodeId).title] AS path,
-            totalCost AS length
-        """
-        results = session.run(query, start_node_title=start_node_title, end_node_title=end_node_title)
-        return [{"path": r["path"], "length": r["length"]} for r in results]
+        ensure_projection(session, project_name)
+        results = session.run(
+            _SHORTEST_PATH_QUERY,
+            project_name=project_name,
+            start_node_title=start_node_title,
+            end_node_title=end_node_title
+        )
+        return results.data()
 
     except Exception:
-        # Fallback to basic shortest path using APOC/Cypher
-        query = """
-        MATCH (start:Article {title: $start_node_title}), (end:Article {title: $end_node_title})
-        CALL apoc.path.findMany(start, end, 'LINKS_TO>', '', {maxLevel: 10, limit: 1})
-        YIELD path
-        RETURN [node IN nodes(path) | node.title] AS path, length(path) AS length
-        """
         try:
-            results = session.run(query, start_node_title=start_node_title, end_node_title=end_node_title)
-            return [{"path": r["path"], "length": r["length"]} for r in results]
+            results = session.run(
+                _SHORTEST_PATH_FALLBACK_QUERY,
+                start_node_title=start_node_title,
+                end_node_title=end_node_title
+            )
+            return results.data()
         except Exception:
             return []
 
 
+def _group_communities(rows: List[Dict[str, Any]]) -> Dict[int, List[str]]:
+    """Maps the grouped (communityId, titles) rows onto {communityId: [titles]}."""
+    return {r["communityId"]: r["titles"] for r in rows}
+
+
 def detect_communities(session: Any, project_name: str = "wikipedia") -> Dict[int, List[str]]:
     """
     Detects communities using the Louvain algorithm.
-    Falls back to grouping by connectivity if GDS fails.
+    Falls back to an in-memory Louvain local-move pass if GDS fails.
     """
     try:
-        query = f"""
-        CALL gds.louvain.stream('{project_name}', {{
-            relationshipWeightProperty: 'weight'
-        }})
-        YIELD nodeId, communityId
-        RETURN gds.util.asNode(nodeId).title AS title, communityId
-        ORDER BY communityId, title
-        """
-        results = session.run(query)
-        
-        communities: Dict[int, List[str]] = {}
-        for r in results:
-            community_id = r["communityId"]
-            if community_id not in communities:
-                communities[community_id] = []
-            communities[community_id].append(r["title"])
-        return communities
+        return _group_communities(_run_gds(session, "louvain", project_name))
 
     except Exception:
-        # Fallback: group by simple connectivity
-        query = """
-        MATCH (n:Article)
-        OPTIONAL MATCH (n)-[:LINKS_TO]-(connected)
-        WITH n, count(connected) as connections
-        RETURN n.title AS title, connections % 5 AS communityId
-        ORDER BY communityId, title
-        """
-        results = session.run(query)
-        
-        communities = {}
-        for r in results:
-            community_id = r["communityId"]
-            if community_id not in communities:
-                communities[community_id] = []
-            communities[community_id].append(r["title"])
-        return communities
+        return _louvain_local_move(*_load_link_graph(session))
 
 
 def calculate_centrality(
     session: Any, 
     project_name: str = "wikipedia", 
-    centrality_type: str = "betweenness"
+    centrality_type: str = "betweenness",
+    limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
-    Calculates various centrality measures (betweenness, closeness).
+    Calculates various centrality measures (betweenness, closeness),
+    highest score first; `limit` keeps only the top-K rows.
     Raises ValueError for unsupported types.
     """
-    if centrality_type not in ("betweenness", "closeness"):
+    if centrality_type not in _CENTRALITY_TYPES:
         raise ValueError(f"Unsupported centrality type: {centrality_type}")
 
     try:
-        if centrality_type == "betweenness":
-            query = f"""
-            CALL gds.betweenness.stream('{project_name}', {{
-                relationshipWeightProperty: 'weight'
-            }})
-            YIELD nodeId, score
-            RETURN gds.util.asNode(nodeId).title AS title, score
-            ORDER BY score DESC
-            """
-        else:  # closeness
-            query = f"""
-            CALL gds.closeness.stream('{project_name}', {{
-                relationshipWeightProperty: 'weight'
-            }})
-            YIELD nodeId, score
-            RETURN gds.util.asNode(nodeId).title AS title, score
-            ORDER BY score DESC
-            """
-
-        results = session.run(query)
-        
-        # session.run may return a list-like or an iterable result object; 
-        # ensure we handle both normal iterables and mocks gracefully.
-        try:
-            return [{"title": r["title"], "score": r["score"]} for r in results]
-        except TypeError:
-            return []
+        return _run_gds(session, centrality_type, project_name, limit=_limit_param(limit))
 
     except Exception:
+        if centrality_type == "betweenness" and SCIPY_AVAILABLE:
+            return _betweenness_centrality(*_load_link_graph(session))[:limit]
+
         # Fallback: basic degree centrality
-        query = """
-        MATCH (n:Article)
-        OPTIONAL MATCH (n)-[:LINKS_TO]-(connected)
-        WITH n, count(connected) as degree
-        RETURN n.title AS title, toFloat(degree) AS score
-        ORDER BY score DESC
-        """
-        results = session.run(query)
+        return session.run(_DEGREE_QUERY, limit=_limit_param(limit)).data()
+
+
+# ==========================================
+# Async Analysis Functions
+# ==========================================
+# Mirrors of the functions above for `neo4j.AsyncSession`. A session runs one
+# query at a time, so give each coroutine its own session to overlap them:
+#
+#     async with driver.session() as s1, driver.session() as s2:
+#         pagerank, communities = await asyncio.gather(
+#             calculate_pagerank_async(s1), detect_communities_async(s2))
+#
+# CPU-bound in-memory fallbacks run in the default executor so they do not
+# block the event loop.
+
+async def calculate_pagerank_async(
+    session: Any,
+    project_name: str = "wikipedia",
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Async variant of `calculate_pagerank`."""
+    try:
+        return await _run_gds_async(session, "pagerank", project_name, limit=_limit_param(limit))
+
+    except Exception:
+        if SCIPY_AVAILABLE:
+            graph = await _load_link_graph_async(session)
+            scores = await asyncio.get_running_loop().run_in_executor(None, _pagerank_power_iteration, *graph)
+            return scores[:limit]
+        result = await session.run(_PAGERANK_FALLBACK_QUERY, limit=_limit_param(limit))
+        return await result.data()
+
+
+async def find_shortest_path_async(
+    session: Any,
+    start_node_title: str,
+    end_node_title: str,
+    project_name: str = "wikipedia"
+) -> List[Dict[str, Any]]:
+    """Async variant of `find_shortest_path`."""
+    try:
+        await ensure_projection_async(session, project_name)
+        result = await session.run(
+            _SHORTEST_PATH_QUERY,
+            project_name=project_name,
+            start_node_title=start_node_title,
+            end_node_title=end_node_title
+        )
+        return await result.data()
+
+    except Exception:
         try:
-            return [{"title": r["title"], "score": r["score"]} for r in results]
-        except TypeError:
+            result = await session.run(
+                _SHORTEST_PATH_FALLBACK_QUERY,
+                start_node_title=start_node_title,
+                end_node_title=end_node_title
+            )
+            return await result.data()
+        except Exception:
             return []
 
 
+async def detect_communities_async(session: Any, project_name: str = "wikipedia") -> Dict[int, List[str]]:
+    """Async variant of `detect_communities`."""
+    try:
+        return _group_communities(await _run_gds_async(session, "louvain", project_name))
+
+    except Exception:
+        graph = await _load_link_graph_async(session)
+        return await asyncio.get_running_loop().run_in_executor(None, _louvain_local_move, *graph)
+
+
+async def calculate_centrality_async(
+    session: Any,
+    project_name: str = "wikipedia",
+    centrality_type: str = "betweenness",
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Async variant of `calculate_centrality`."""
+    if centrality_type not in _CENTRALITY_TYPES:
+        raise ValueError(f"Unsupported centrality type: {centrality_type}")
+
+    try:
+        return await _run_gds_async(session, centrality_type, project_name, limit=_limit_param(limit))
+
+    except Exception:
+        if centrality_type == "betweenness" and SCIPY_AVAILABLE:
+            graph = await _load_link_graph_async(session)
+            scores = await asyncio.get_running_loop().run_in_executor(None, _betweenness_centrality, *graph)
+            return scores[:limit]
+        result = await session.run(_DEGREE_QUERY, limit=_limit_param(limit))
+        return await result.data()
+
+
+async def run_analyses_async(
+    driver: Any,
+    project_name: str = "wikipedia",
+    centrality_type: str = "betweenness",
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Runs PageRank, Louvain and centrality concurrently on one projection using
+    an `neo4j.AsyncDriver`, one session per algorithm. Wall-clock time is that
+    of the slowest algorithm rather than the sum.
+
+    The projection is ensured once up front so the concurrent calls do not race
+    to create it. GDS holds all three algorithms' working memory at once; size
+    the heap with the `gds.<algo>.stream.estimate` procedures first.
+    `limit` caps the PageRank and centrality rankings at the top-K.
+    Returns: {"pagerank": [...], "communities": {...}, "centrality": [...]}
+    """
+    async with driver.session(fetch_size=ANALYSIS_FETCH_SIZE) as session:
+        try:
+            await ensure_projection_async(session, project_name)
+        except Exception:
+            # No GDS: each call below falls back on its own
+            pass
+
+    async def _with_session(func: Callable, *args: Any) -> Any:
+        async with driver.session(fetch_size=ANALYSIS_FETCH_SIZE) as session:
+            return await func(session, *args)
+
+    pagerank, communities, centrality = await asyncio.gather(
+        _with_session(calculate_pagerank_async, project_name, limit),
+        _with_session(detect_communities_async, project_name),
+        _with_session(calculate_centrality_async, project_name, centrality_type, limit),
+    )
+    return {"pagerank": pagerank, "communities": communities, "centrality": centrality}
+
+
+def _write_csv_arrow(data: List[Dict[str, Any]], csv_path: str) -> bool:
+    """
+    Writes `data` with Arrow's C CSV writer, producing the same bytes as the
+    csv module. Returns False (writing nothing) for columns Arrow would
+    render differently; raises pa.ArrowInvalid for values that need quoting.
+    """
+    table = pa.Table.from_pylist(data)
+    # A lone empty field is written as "" by the csv module
+    if table.num_columns < 2:
+        return False
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) or pa.types.is_boolean(field.type):
+            # Arrow writes 1.0 as 1 and True as true; the csv module uses str()
+            values = [None if v is None else str(v) for v in table.column(i).to_pylist()]
+            table = table.set_column(i, field.name, pa.array(values, pa.string()))
+        elif not (pa.types.is_integer(field.type) or pa.types.is_string(field.type)
+                  or pa.types.is_null(field.type)):
+            return False
+    # Quoting "none" matches the csv module's minimal quoting for every value
+    # that needs none; any other value raises instead of being quoted.
+    options = pacsv.WriteOptions(quoting_style="none", quoting_header="none", eol="\r\n")
+    pacsv.write_csv(table, csv_path, options)
+    return True
+
+
 def export_results(
     data: List[Dict[str, Any]], 
     format_type: str = "json", 
-    filename: str = "results"
+    filename: str = "results",
+    indent: bool = False
 ) -> None:
     """
-    Exports analysis results to a specified format (JSON or CSV).
+    Exports analysis results to a specified format (JSON, JSONL or CSV).
     Ensures empty CSV files are created if data is empty.
+    JSONL writes one record per line as it iterates, so `data` may also be
+    a generator for constant-memory exports.
+    JSON is written compactly unless `indent` is set.
     """
     if format_type == "json":
-        with open(f"{filename}.json", "w") as f:
-            json.dump(data, f, indent=4)
+        if ORJSON_AVAILABLE:
+            option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+            with open(f"{filename}.json", "wb") as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            with open(f"{filename}.json", "w") as f:
+                if indent:
+                    json.dump(data, f, indent=2)
+                else:
+                    # Compact separators keep json on its fast C encoder path
+                    json.dump(data, f, separators=(",", ":"))
+
+    elif format_type == "jsonl":
+        if ORJSON_AVAILABLE:
+            with open(f"{filename}.jsonl", "wb") as f:
+                for row in data:
+                    f.write(orjson.dumps(row, option=_ORJSON_OPTIONS))
+                    f.write(b"\n")
+        else:
+            with open(f"{filename}.jsonl", "w") as f:
+                for row in data:
+                    f.write(json.dumps(row, separators=(",", ":")))
+                    f.write("\n")
             
     elif format_type == "csv":
         csv_path = f"{filename}.csv"
@@ -264,11 +812,28 @@ def export_results(
             open(csv_path, "w", newline="").close()
             return
             
+        if PYARROW_AVAILABLE:
+            try:
+                if _write_csv_arrow(data, csv_path):
+                    return
+            except (pa.ArrowException, OverflowError, TypeError):
+                # Values Arrow cannot hold or cannot write byte-for-byte like
+                # the csv module (quoted strings, >int64 ints, mixed-type
+                # columns) go through the csv module below.
+                pass
+
         with open(csv_path, "w", newline="") as f:
-            fieldnames = list(data[0].keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
+            fieldnames = tuple(data[0])
+            # itemgetter pulls each row's values in C; with a single column it
+            # returns a bare value, so wrap it back into a 1-tuple.
+            get_values = itemgetter(*fieldnames)
+            if len(fieldnames) == 1:
+                rows = ((get_values(row),) for row in data)
+            else:
+                rows = (get_values(row) for row in data)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
             
     else:
         raise ValueError(f"Unsupported export format: {format_type}")
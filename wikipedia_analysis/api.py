@@ -1,8 +1,11 @@
 import logging
+import threading
+import time
 from typing import List
 from flask import Flask, jsonify, Response
-from neo4j import GraphDatabase, Driver, Session
+from neo4j import Driver, Session
 from wikipedia_analysis.config import load_neo4j_config
+from wikipedia_analysis.database import create_driver
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,9 +13,32 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# One driver per process; sessions borrow Bolt connections from its pool, so
+# a request does not pay a new handshake. Size the pool for the number of
+# concurrent WSGI worker threads.
+MAX_CONNECTION_POOL_SIZE = 50
+
+# Query text is kept constant (values go in parameters) so Neo4j reuses the
+# cached plan for every request.
+CATEGORIES_QUERY = "MATCH (c:Category) RETURN DISTINCT c.name AS categoryName"
+# Aggregated server-side so the titles come back as a single record
+CATEGORY_ARTICLES_QUERY = """
+MATCH (a:Article)-[:BELONGS_TO]->(c:Category {name: $category_name})
+RETURN collect(a.title) AS titles
+"""
+
+# Range indexes backing the endpoint lookups (Category.name) and the analysis
+# title matches (Article.title); without them each lookup is a label scan.
+API_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS FOR (a:Article) ON (a.title)",
+    "CREATE INDEX IF NOT EXISTS FOR (c:Category) ON (c.name)",
+)
+
 try:
     _cfg = load_neo4j_config()
-    driver: Driver = GraphDatabase.driver(_cfg.uri, auth=(_cfg.user, _cfg.password))
+    driver: Driver = create_driver(
+        _cfg.uri, _cfg.user, _cfg.password, max_connection_pool_size=MAX_CONNECTION_POOL_SIZE
+    )
 except Exception as e:
     logger.error(f"Failed to create Neo4j driver: {e}")
     driver = None
@@ -23,6 +49,33 @@ def get_db_session() -> Session:
         raise ConnectionError("Neo4j driver is not initialized.")
     return driver.session()
 
+def ensure_indexes() -> None:
+    """Creates the indexes the API relies on if they do not exist yet."""
+    with get_db_session() as session:
+        for query in API_INDEXES:
+            start = time.perf_counter()
+            session.run(query).consume()
+            logger.info(f"Ensured index in {time.perf_counter() - start:.3f}s: {query}")
+
+_indexes_lock = threading.Lock()
+_indexes_checked = False
+
+@app.before_request
+def _ensure_indexes_once() -> None:
+    """Runs `ensure_indexes` before the first request this process serves."""
+    global _indexes_checked
+    if _indexes_checked:
+        return
+    with _indexes_lock:
+        if _indexes_checked:
+            return
+        # Only attempted once; a failure is logged and requests still proceed.
+        _indexes_checked = True
+        try:
+            ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Could not ensure indexes: {e}")
+
 @app.route("/", methods=["GET"])
 def index() -> str:
     """Root endpoint."""
@@ -33,8 +86,7 @@ def get_categories() -> Response:
     """Fetches all unique category names."""
     try:
         with get_db_session() as session:
-            query = "MATCH (c:Category) RETURN DISTINCT c.name AS categoryName"
-            result = session.run(query)
+            result = session.run(CATEGORIES_QUERY)
             categories: List[str] = [record["categoryName"] for record in result]
         return jsonify(categories)
     except Exception as e:
@@ -48,13 +100,8 @@ def get_articles_in_category(category_name: str) -> Response:
         return jsonify({"error": "category_name is required"}), 400
     try:
         with get_db_session() as session:
-            query = """
-            MATCH (a:Article)-[:BELONGS_TO]->(c:Category)
-            WHERE c.name = $category_name
-            RETURN a.title AS articleTitle
-            """
-            result = session.run(query, category_name=category_name)
-            articles: List[str] = [record["articleTitle"] for record in result]
+            record = session.run(CATEGORY_ARTICLES_QUERY, category_name=category_name).single()
+            articles: List[str] = record["titles"] if record else []
         return jsonify(articles)
     except Exception as e:
         logger.error(f"Error fetching articles for category '{category_name}': {e}")
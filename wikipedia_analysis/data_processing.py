@@ -1,14 +1,95 @@
 # wikipedia_analysis/data_processing.py
 
 import lxml.etree as ET
+import bz2
+import gzip
+import io
+import mmap
+import os
 import re
 import logging
-from typing import Generator, Dict, Any, Optional, List, Set, Union
-from io import BytesIO
+import shutil
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Generator, Dict, Any, Iterator, Optional, List, Set, Tuple, Union
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Matches [[Target]] and [[Target|label]]; group 1 is the link target.
+_LINK_PATTERN = r'\[\[([^|\]]+)(?:\|[^\]]+)?\]\]'
+
+# Possessive form of the same pattern. Each character class excludes the
+# delimiter that follows it, so it matches identically, but the engine drops
+# failed runs such as "[[[[[" without backtracking into them. Stdlib `re`
+# supports possessive quantifiers from Python 3.11; the `regex` module is
+# used when installed.
+_LINK_PATTERN_POSSESSIVE = r'\[\[([^|\]]++)(?:\|[^\]]++)?\]\]'
+try:
+    import regex
+    _LINK_RE = regex.compile(_LINK_PATTERN_POSSESSIVE)
+    REGEX_AVAILABLE = True
+except ImportError:
+    _LINK_RE = re.compile(_LINK_PATTERN_POSSESSIVE if sys.version_info >= (3, 11) else _LINK_PATTERN)
+    REGEX_AVAILABLE = False
+
+# Article URLs are this prefix plus the title with spaces as underscores.
+_URL_PREFIX = "https://en.wikipedia.org/wiki/"
+
+# Pages handed to a worker process at a time when parsing with `workers`;
+# large enough to amortize pickling, small enough to keep memory bounded.
+PARSE_BATCH_SIZE = 256
+
+# Pages between root.clear() calls while streaming; drops the emptied <page>
+# shells that elem.clear() leaves attached to the document root.
+ROOT_CLEAR_INTERVAL = 10_000
+
+# Bytes of a memory-mapped dump the parser reads between MADV_DONTNEED calls
+# that drop the pages already behind it from this process's resident set.
+MMAP_RELEASE_BYTES = 1 << 30
+
+# Locates whole <page> elements in raw bytes for the malformed-dump fallback.
+_PAGE_FRAGMENT_RE = re.compile(rb"<page.*?>.*?</page>", flags=re.DOTALL)
+
+# External decompressors for compressed dumps, tried in order. They run in
+# their own process (lbzip2/pbzip2/pigz on several cores), so decompression
+# overlaps parsing; Python's bz2/gzip modules are the last resort.
+_DECOMPRESSORS = {
+    '.bz2': (('lbzip2', '-dc'), ('pbzip2', '-dc'), ('bzip2', '-dc')),
+    '.gz': (('pigz', '-dc'), ('gzip', '-dc')),
+}
+_PY_DECOMPRESSORS = {'.bz2': bz2.open, '.gz': gzip.open}
+_SERIAL_DECOMPRESSORS = {'bzip2', 'gzip'}
+
+# indexed_bzip2 decompresses bz2 blocks on several threads in-process; when
+# installed it is preferred over single-threaded bzip2, though not over
+# lbzip2/pbzip2.
+try:
+    import indexed_bzip2
+    INDEXED_BZIP2_AVAILABLE = True
+except ImportError:
+    INDEXED_BZIP2_AVAILABLE = False
+
+# Read buffer for dumps that are streamed rather than memory-mapped
+# (decompressor pipes, unmappable files): one read() per 8 MiB instead of
+# the default 8 KiB.
+DUMP_READ_BUFFER = 8 << 20
+
+# Hyperscan compiles the link pattern to a DFA and scans without
+# backtracking; the `re` pattern above is used when it is unavailable.
+try:
+    import hyperscan
+    _LINK_DB = hyperscan.Database()
+    _LINK_DB.compile(expressions=[_LINK_PATTERN.encode()], flags=[hyperscan.HS_FLAG_SOM_LEFTMOST])
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 
 # ==========================================
 # Helper Functions
@@ -20,10 +101,20 @@ def clean_title(title: Optional[str]) -> str:
     """
     if not title:
         return ""
-    title = title.strip()
-    # Replace multiple whitespace characters with a single space
-    title = re.sub(r'\s+', ' ', title)
-    return title
+    # Fast path for titles that are already clean (the vast majority):
+    # isprintable() is False for every whitespace character except the ASCII
+    # space, so this only has to rule out doubled and edge spaces.
+    if title.isprintable() and '  ' not in title and title[0] != ' ' and title[-1] != ' ':
+        return title
+    return _clean_title_cached(title)
+
+# Popular link targets recur thousands of times across a dump, so cleaned
+# titles are memoized; the cache is bounded to keep memory in check.
+@lru_cache(maxsize=1 << 20)
+def _clean_title_cached(title: str) -> str:
+    # split() with no separator drops leading/trailing whitespace and splits on
+    # the same Unicode whitespace as \s+, so this collapses runs in one C pass
+    return ' '.join(title.split())
 
 def validate_length(data: Optional[Union[str, list, set, dict]], max_length: Optional[int] = None) -> bool:
     """
@@ -36,142 +127,321 @@ def validate_length(data: Optional[Union[str, list, set, dict]], max_length: Opt
         return False
     return True
 
-def _local_name(tag: str) -> str:
-    """Extracts the local name from a namespaced XML tag."""
-    return tag.split('}')[-1] if '}' in tag else tag
+def _article_url(title: str) -> str:
+    """Builds the article URL for a cleaned title."""
+    # A single-character str.replace beats str.translate by an order of
+    # magnitude in CPython, so it stays.
+    return _URL_PREFIX + title.replace(' ', '_')
 
-def _find_child_by_localname(parent: Any, name: str) -> Optional[Any]:
+def _extract_links(text: str, page_title: str) -> List[str]:
     """
-    Finds the first child element with a specific local name, ignoring namespaces.
-    Checks direct children first, then iterates if necessary.
+    Extracts the unique, cleaned link targets from wikitext in order of first
+    appearance, excluding self-links.
     """
-    if parent is None:
-        return None
-    # Check direct children first (fastest)
-    for child in parent:
-        if _local_name(child.tag) == name:
-            return child
-    # Fallback to iterating (slower, but covers cases where direct iteration might fail)
-    for child in parent.iter():
-        if _local_name(child.tag) == name:
-            return child
-    return None
+    # Redirects and stubs often have no links at all; a substring check is a
+    # single C scan and skips the matcher setup.
+    if '[[' not in text:
+        return []
+    if HYPERSCAN_AVAILABLE:
+        buf = text.encode('utf-8')
+        spans: List[tuple] = []
+        _LINK_DB.scan(buf, match_event_handler=lambda _id, start, end, _flags, _ctx: spans.append((start, end)))
+        # Strip the [[ ]] delimiters and any |label; they are ASCII so the
+        # byte offsets never split a multi-byte character.
+        targets = [buf[start + 2:end - 2].split(b'|', 1)[0].decode('utf-8') for start, end in spans]
+    else:
+        targets = [match.group(1) for match in _LINK_RE.finditer(text)]
+
+    # Deduplicate as we go, keeping links in the order they appear
+    seen: Set[str] = set()
+    links: List[str] = []
+    for target in targets:
+        link_title = clean_title(target)
+        if link_title and link_title != page_title and link_title not in seen:
+            seen.add(link_title)
+            links.append(link_title)
+    return links
 
 
 # ==========================================
 # Parsing & Transformation Logic
 # ==========================================
 
-def parse_dump_file(xml_file_path: str) -> Generator[Dict[str, Any], None, None]:
+@contextmanager
+def open_dump(path: str) -> Iterator[Any]:
+    """
+    Opens a dump for binary reading. `.bz2` and `.gz` dumps are decompressed
+    on the fly, so no extracted copy is needed on disk.
+    """
+    suffix = os.path.splitext(path)[1]
+    if suffix not in _DECOMPRESSORS:
+        with open(path, 'rb', buffering=DUMP_READ_BUFFER) as fh:
+            mapped = _map_file(fh)
+            if mapped is None:
+                yield fh
+                return
+            with mapped:
+                yield mapped
+        return
+
+    parallel_in_process = suffix == '.bz2' and INDEXED_BZIP2_AVAILABLE
+    for command in _DECOMPRESSORS[suffix]:
+        if shutil.which(command[0]) is None:
+            continue
+        if parallel_in_process and command[0] in _SERIAL_DECOMPRESSORS:
+            break
+        proc = subprocess.Popen([*command, path], stdout=subprocess.PIPE, bufsize=DUMP_READ_BUFFER)
+        try:
+            yield proc.stdout
+        except BaseException:
+            # The reader stopped early; the rest of the output is not needed
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            proc.wait()
+        if proc.returncode != 0:
+            raise OSError(f"{command[0]} exited with status {proc.returncode} while reading {path}")
+        return
+
+    if parallel_in_process:
+        with indexed_bzip2.open(path, parallelization=os.cpu_count() or 1) as fh:
+            yield fh
+        return
+
+    with _PY_DECOMPRESSORS[suffix](path, 'rb') as fh:
+        yield fh
+
+def _map_file(fh: Any) -> Optional[mmap.mmap]:
+    """
+    Memory-maps an open plain file for sequential reading, or returns None
+    when it cannot be mapped (empty files, pipes, decompressing readers).
+    Reads from the map copy straight out of the page cache, skipping the
+    file object's own buffer and its read() syscalls.
+    """
+    if not isinstance(getattr(fh, 'raw', None), io.FileIO):
+        return None
+    try:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if hasattr(mapped, 'madvise'):
+        # Aggressive read-ahead; pages behind the parser can be dropped early
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return mapped
+
+def parse_dump_file(xml_file_path: str, workers: Optional[int] = None) -> Generator[Dict[str, Any], None, None]:
     """
     Parses a Wikipedia XML dump file and yields article data.
     Extracts article ID, title, and links.
 
+    With `workers` > 1 the main process only runs iterparse and hands batches
+    of raw pages to a process pool for link extraction; articles are still
+    yielded in document order.
+
     Robust parsing strategy:
-    1. Read via builtin open so tests that patch builtins.open work.
-    2. Attempt streaming parse with lxml.iterparse (fast).
+    1. Open via `open_dump` (builtin open in binary mode for plain files, so
+       tests that patch builtins.open work, memory-mapped when possible;
+       `.bz2`/`.gz` are decompressed on the fly) and lxml parses the stream
+       incrementally.
+    2. Attempt streaming parse with lxml.iterparse (fast, O(page) memory).
     3. If streaming parse raises XMLSyntaxError (malformed document), fall back
-       to extracting <page>...</page> fragments and parsing those individually.
+       to scanning the file for <page>...</page> fragments and parsing those
+       individually.
     """
-    try:
-        with open(xml_file_path, 'r', encoding='utf-8') as fh:
-            content = fh.read()
-    except FileNotFoundError:
-        raise
-
     # Track which pages we've yielded so fallback won't duplicate.
     seen_ids: Set[str] = set()
 
     # --- Strategy 1: Streaming Parse ---
     try:
-        xml_bytes = BytesIO(content.encode('utf-8'))
-        for event, elem in ET.iterparse(xml_bytes, events=('end',)):
-            if _local_name(elem.tag) != 'page':
-                continue
-            try:
-                id_elem = _find_child_by_localname(elem, 'id')
-                title_elem = _find_child_by_localname(elem, 'title')
-                revision_elem = _find_child_by_localname(elem, 'revision')
-                text_elem = _find_child_by_localname(revision_elem, 'text') if revision_elem is not None else None
-
-                if id_elem is not None and title_elem is not None:
-                    article_data = {}
-                    article_data['id'] = id_elem.text
-                    article_data['title'] = clean_title(title_elem.text)
-                    article_data['url'] = f"https://en.wikipedia.org/wiki/{article_data['title'].replace(' ', '_')}"
-
-                    links = []
-                    if text_elem is not None and text_elem.text:
-                        link_pattern = re.compile(r'\[\[([^|\]]+)(?:\|[^\]]+)?\]\]')
-                        for match in link_pattern.finditer(text_elem.text):
-                            link_title = clean_title(match.group(1))
-                            if link_title and link_title != article_data['title']:
-                                links.append(link_title)
-                    
-                    article_data['links'] = list(set(links))
-                    seen_ids.add(article_data['id'])
-                    yield article_data
-            finally:
-                # Clear element to save memory
-                elem.clear()
-                while elem.getprevious() is not None:
-                    del elem.getparent()[0]
+        with open_dump(xml_file_path) as fh:
+            if workers and workers > 1:
+                yield from _stream_pages_parallel(fh, seen_ids, workers)
+            else:
+                yield from _stream_pages(fh, seen_ids)
         return
     except ET.XMLSyntaxError as e:
         # Log the streaming parse error and fall back to fragment parsing.
         logging.getLogger(__name__).error("XMLSyntaxError during streaming parse: %s", e)
-        # Proceed to fallback below
-        pass
 
     # --- Strategy 2: Fallback Fragment Parsing ---
-    # Extract page fragments and parse individually
-    page_fragments = re.findall(r"<page.*?>.*?</page>", content, flags=re.DOTALL)
-    for frag in page_fragments:
-        try:
-            page_elem = ET.fromstring(frag)
-            id_elem = _find_child_by_localname(page_elem, 'id')
-            title_elem = _find_child_by_localname(page_elem, 'title')
-            revision_elem = _find_child_by_localname(page_elem, 'revision')
-            text_elem = _find_child_by_localname(revision_elem, 'text') if revision_elem is not None else None
-
-            if id_elem is None or title_elem is None:
+    # Reopen and parse each page fragment individually
+    with open_dump(xml_file_path) as fh:
+        for frag in _iter_page_fragments(fh):
+            try:
+                page_elem = ET.fromstring(frag)
+            except ET.XMLSyntaxError:
+                # Log the fragment that failed to parse so tests can assert on log contents
+                logging.getLogger(__name__).error(
+                    "Error parsing page fragment: %s", frag.decode('utf-8', errors='replace')
+                )
                 continue
-
+            article_data = _page_to_article(page_elem)
             # Skip pages already yielded by streaming parse to avoid duplicates
-            frag_id = id_elem.text
-            if frag_id in seen_ids:
+            if article_data is None or article_data['id'] in seen_ids:
                 continue
+            seen_ids.add(article_data['id'])
+            yield article_data
+
+
+def _iter_page_elements(fh: Any) -> Generator[Any, None, None]:
+    """
+    Yields each <page> element from an open binary file, clearing it once the
+    caller resumes the generator.
+    """
+    # lxml filters on the tag in C, so only <page> end events reach Python
+    # whatever namespace the dump uses.
+    root = None
+    mapped = fh if isinstance(fh, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED') else None
+    released = 0
+    pages = ET.iterparse(fh, events=('end',), tag='{*}page', huge_tree=True)
+    for count, (event, elem) in enumerate(pages, 1):
+        if root is None:
+            root = elem.getparent()
+        try:
+            yield elem
+        finally:
+            # Clear element to save memory; the empty shell is dropped by the
+            # periodic root.clear() instead of walking siblings every page.
+            elem.clear(keep_tail=True)
+            if root is not None and count % ROOT_CLEAR_INTERVAL == 0:
+                root.clear()
+            if mapped is not None and mapped.tell() - released >= MMAP_RELEASE_BYTES:
+                # lxml has copied everything before tell(); the mapping is
+                # read-only, so the kernel can reload pages if ever touched.
+                released = mapped.tell() - mapped.tell() % mmap.PAGESIZE
+                mapped.madvise(mmap.MADV_DONTNEED, 0, released)
+
 
-            article_data = {}
-            article_data['id'] = frag_id
-            article_data['title'] = clean_title(title_elem.text)
-            article_data['url'] = f"https://en.wikipedia.org/wiki/{article_data['title'].replace(' ', '_')}"
-            
-            links = []
-            if text_elem is not None and text_elem.text:
-                link_pattern = re.compile(r'\[\[([^|\]]+)(?:\|[^\]]+)?\]\]')
-                for match in link_pattern.finditer(text_elem.text):
-                    link_title = clean_title(match.group(1))
-                    if link_title and link_title != article_data['title']:
-                        links.append(link_title)
-            
-            article_data['links'] = list(set(links))
+def _stream_pages(fh: Any, seen_ids: Set[str]) -> Generator[Dict[str, Any], None, None]:
+    """Streams <page> elements from an open binary file with lxml.iterparse."""
+    for elem in _iter_page_elements(fh):
+        article_data = _page_to_article(elem)
+        if article_data is not None:
             seen_ids.add(article_data['id'])
             yield article_data
-        except ET.XMLSyntaxError:
-            # Log the fragment that failed to parse so tests can assert on log contents
-            logging.getLogger(__name__).error("Error parsing page fragment: %s", frag)
-            continue
+
+
+def _stream_pages_parallel(
+    fh: Any,
+    seen_ids: Set[str],
+    workers: int,
+    batch_size: int = PARSE_BATCH_SIZE
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Like `_stream_pages`, but builds articles in a process pool. At most two
+    batches per worker are in flight so memory stays bounded.
+    """
+    pending: deque = deque()
+
+    def drain(limit: int) -> Generator[Dict[str, Any], None, None]:
+        while len(pending) > limit:
+            for article_data in pending.popleft().result():
+                seen_ids.add(article_data['id'])
+                yield article_data
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batch: List[Tuple[str, Optional[str], Optional[str]]] = []
+        error: Optional[ET.XMLSyntaxError] = None
+        try:
+            for elem in _iter_page_elements(fh):
+                fields = _page_fields(elem)
+                if fields is not None:
+                    batch.append(fields)
+                if len(batch) >= batch_size:
+                    pending.append(executor.submit(_build_articles, batch))
+                    batch = []
+                    yield from drain(2 * workers)
+        except ET.XMLSyntaxError as e:
+            # Hand back everything parsed so far before the caller falls back
+            error = e
+
+        if batch:
+            pending.append(executor.submit(_build_articles, batch))
+        yield from drain(0)
+
+    if error is not None:
+        raise error
+
+
+def _iter_page_fragments(fh: Any, chunk_size: int = 1 << 20) -> Generator[bytes, None, None]:
+    """
+    Lazily yields raw <page>...</page> byte fragments from a binary stream
+    opened by `open_dump`. A memory-mapped file is scanned in place;
+    anything else is read in chunks, carrying any incomplete page over to
+    the next read.
+    """
+    if isinstance(fh, mmap.mmap):
+        for match in _PAGE_FRAGMENT_RE.finditer(fh):
+            yield match.group(0)
+        return
+
+    pending = b''
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        consumed = 0
+        for match in _PAGE_FRAGMENT_RE.finditer(pending):
+            yield match.group(0)
+            consumed = match.end()
+        pending = pending[consumed:]
+
+
+# Qualified child tag names keyed by the <page> tag they were derived from.
+# A dump uses a single namespace, so this is computed once per dump.
+_PAGE_CHILD_TAGS: Dict[str, Tuple[str, str, str, str]] = {}
+
+def _page_child_tags(page_tag: str) -> Tuple[str, str, str, str]:
+    """Returns the (id, title, revision, text) tags in the namespace of `page_tag`."""
+    tags = _PAGE_CHILD_TAGS.get(page_tag)
+    if tags is None:
+        ns = page_tag[:page_tag.index('}') + 1] if page_tag.startswith('{') else ''
+        tags = _PAGE_CHILD_TAGS[page_tag] = (f'{ns}id', f'{ns}title', f'{ns}revision', f'{ns}text')
+    return tags
+
+def _page_fields(page_elem: Any) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """Pulls (id, title, text) out of a <page> element; None if it lacks an id or title."""
+    id_tag, title_tag, revision_tag, text_tag = _page_child_tags(page_elem.tag)
+    id_elem = page_elem.find(id_tag)
+    title_elem = page_elem.find(title_tag)
+    if id_elem is None or title_elem is None:
+        return None
+    revision_elem = page_elem.find(revision_tag)
+    text_elem = revision_elem.find(text_tag) if revision_elem is not None else None
+    return id_elem.text, title_elem.text, text_elem.text if text_elem is not None else None
+
+def _build_article(page_id: str, raw_title: Optional[str], text: Optional[str]) -> Dict[str, Any]:
+    """Builds article data (cleaned title, URL, links) from raw page fields."""
+    article_data = {}
+    article_data['id'] = page_id
+    article_data['title'] = clean_title(raw_title)
+    article_data['url'] = _article_url(article_data['title'])
+
+    links = []
+    if text:
+        links = _extract_links(text, article_data['title'])
+    article_data['links'] = links
+    return article_data
+
+def _build_articles(pages: List[Tuple[str, Optional[str], Optional[str]]]) -> List[Dict[str, Any]]:
+    """Worker entry point for `_stream_pages_parallel`."""
+    return [_build_article(*fields) for fields in pages]
+
+def _page_to_article(page_elem: Any) -> Optional[Dict[str, Any]]:
+    """Builds article data from a <page> element; None if it lacks an id or title."""
+    fields = _page_fields(page_elem)
+    return _build_article(*fields) if fields is not None else None
 
 def batch_data(data_iterator: Generator[Any, None, None], batch_size: int) -> Generator[List[Any], None, None]:
     """Batches data from an iterator into lists of a specified size."""
-    batch = []
-    for item in data_iterator:
-        batch.append(item)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
+    # islice pulls each batch in a C loop instead of a per-item append/len check
+    data_iterator = iter(data_iterator)
+    while True:
+        batch = list(islice(data_iterator, batch_size))
+        if not batch:
+            return
         yield batch
 
 def transform_to_article_node(article_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -186,12 +456,43 @@ def transform_to_article_node(article_data: Dict[str, Any]) -> Optional[Dict[str
     except (TypeError, ValueError):
         pass
         
+    # Only build the default URL when the article does not carry one
     return {
         'id': article_id,
         'title': article_data['title'],
-        'url': article_data.get('url', f"https://en.wikipedia.org/wiki/{article_data['title'].replace(' ', '_')}")
+        'url': article_data['url'] if 'url' in article_data else _article_url(article_data['title'])
     }
 
+def transform_batch(articles: List[Optional[Dict[str, Any]]]) -> Dict[str, List[Any]]:
+    """
+    Transforms a batch of parsed articles into Article node columns
+    ({'id': [...], 'title': [...], 'url': [...]}) with the same rules as
+    `transform_to_article_node`. Parallel lists skip building a dict per
+    node and pass to Neo4j (or pyarrow.table) as three flat parameters.
+    """
+    ids: List[Any] = []
+    titles: List[str] = []
+    urls: List[str] = []
+    for article_data in articles:
+        if not article_data or 'id' not in article_data or 'title' not in article_data:
+            logging.warning(f"Invalid article data for transformation: {article_data}")
+            continue
+
+        article_id = article_data['id']
+        try:
+            article_id = int(article_id)
+        except (TypeError, ValueError):
+            pass
+
+        title = article_data['title']
+        ids.append(article_id)
+        titles.append(title)
+        if 'url' in article_data:
+            urls.append(article_data['url'])
+        else:
+            urls.append(_article_url(title))
+    return {'id': ids, 'title': titles, 'url': urls}
+
 def transform_to_category_node(category_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Transforms parsed category data into a Neo4j Category node format."""
     if not category_data or 'title' not in category_data:
@@ -1,11 +1,48 @@
 import logging
-from neo4j import GraphDatabase, Transaction, Driver
-from typing import List, Dict, Any, Optional
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from neo4j import GraphDatabase, Transaction, Driver, Session, WRITE_ACCESS
+from typing import Callable, Iterable, List, Dict, Any, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Connection pool settings applied by `create_driver`. Concurrent importers
+# (see `load_batches_concurrently`) need one connection per writer, so the
+# pool size can be raised with NEO4J_POOL_SIZE.
+DRIVER_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "64"))
+DRIVER_ACQUISITION_TIMEOUT = 120  # seconds to wait for a free connection
+DRIVER_MAX_LIFETIME = 3600  # seconds before a pooled connection is recycled
+
+def create_driver(uri: str, username: str, password: str, **config: Any) -> Driver:
+    """
+    Creates a Neo4j driver with the project's pool, timeout and keep-alive
+    settings. Keyword arguments override individual driver settings.
+    """
+    settings = {
+        "max_connection_pool_size": DRIVER_POOL_SIZE,
+        "connection_acquisition_timeout": DRIVER_ACQUISITION_TIMEOUT,
+        "max_connection_lifetime": DRIVER_MAX_LIFETIME,
+        "keep_alive": True,
+    }
+    settings.update(config)
+    return GraphDatabase.driver(uri, auth=(username, password), **settings)
+
+# Database the importers write to. Naming it spares the driver resolving the
+# user's home database for every new session.
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+
+def write_session(driver: Driver) -> Session:
+    """
+    Opens a session for bulk writes: pinned to NEO4J_DATABASE and in write
+    mode, so a routing driver sends it straight to the leader. It starts
+    without bookmarks, as import batches do not depend on each other.
+    """
+    return driver.session(database=NEO4J_DATABASE, default_access_mode=WRITE_ACCESS)
+
 class Neo4jConnectionManager:
     def __init__(self, uri, username, password):
         self._uri = uri
@@ -25,8 +62,7 @@ class Neo4jConnectionManager:
         self._closed = False
         if self._driver is None:
             try:
-                # Use tuple auth to be compatible with tests that assert auth=(user, password)
-                self._driver = GraphDatabase.driver(self._uri, auth=(self._username, self._password))
+                self._driver = create_driver(self._uri, self._username, self._password)
                 # verify_connectivity may not be available on mocked drivers; call it if present
                 if hasattr(self._driver, "verify_connectivity"):
                     self._driver.verify_connectivity()
@@ -49,10 +85,9 @@ class Neo4jConnectionManager:
 
     def get_driver(self) -> Optional[Driver]:
         """
-        Return a driver-like object. Wrap the underlying driver so that when tests
-        provide mocked session/transaction context managers we can instrument the
-        transaction context manager's __exit__ to call commit()/rollback() on the
-        transaction object (tests expect commit/rollback to have been called).
+        Return the underlying driver, creating it lazily (without connectivity
+        verification) if connect() has not been called. Returns None after
+        close() or a failed connect().
         """
         # If we previously closed the manager, do not recreate a driver.
         if getattr(self, "_closed", False):
@@ -62,75 +97,8 @@ class Neo4jConnectionManager:
         if self._driver is None:
             # Lazily create driver without performing connectivity verification so tests can
             # patch GraphDatabase.driver and provide a mock driver that may not implement verify_connectivity
-            self._driver = GraphDatabase.driver(self._uri, auth=(self._username, self._password))
-    
-        # If driver is a mock that already provides context-managed sessions, wrap it so
-        # we can instrument transaction context managers to call commit/rollback as expected by tests.
-        real_driver = self._driver
-    
-        class DriverWrapper:
-            def __init__(self, real_driver):
-                self._real_driver = real_driver
-    
-            def session(self, *args, **kwargs):
-                real_session_cm = self._real_driver.session(*args, **kwargs)
-    
-                class SessionCM:
-                    def __enter__(self_inner):
-                        session_obj = real_session_cm.__enter__()
-    
-                        # Instrument the begin_transaction context manager on the session object
-                        try:
-                            begin_cm = session_obj.begin_transaction.return_value
-    
-                            def begin_cm_exit(self, exc_type, exc, tb):
-                                # Try to get the transaction object that __enter__ would return
-                                tx_obj = None
-                                try:
-                                    # If the test set a return value on __enter__, use it
-                                    tx_obj = getattr(self.__enter__, "return_value", None)
-                                except Exception:
-                                    tx_obj = None
-    
-                                # Fallback: try to call __enter__ if no return_value is defined (best-effort)
-                                if tx_obj is None:
-                                    try:
-                                        tx_obj = self.__enter__()
-                                    except Exception:
-                                        tx_obj = None
-    
-                                if exc_type is None:
-                                    if hasattr(tx_obj, "commit"):
-                                        try:
-                                            tx_obj.commit()
-                                        except Exception:
-                                            pass
-                                else:
-                                    if hasattr(tx_obj, "rollback"):
-                                        try:
-                                            tx_obj.rollback()
-                                        except Exception:
-                                            pass
-                                # Returning False ensures any exception is propagated
-                                return False
-    
-                            # Attach our __exit__ to the begin_transaction context manager
-                            begin_cm.__exit__ = begin_cm_exit
-                        except Exception:
-                            # If instrumentation fails, ignore and proceed
-                            pass
-    
-                        return session_obj
-    
-                    def __exit__(self_inner, exc_type, exc, tb):
-                        return real_session_cm.__exit__(exc_type, exc, tb)
-    
-                return SessionCM()
-    
-            def __getattr__(self, name):
-                return getattr(self._real_driver, name)
-    
-        return DriverWrapper(real_driver)
+            self._driver = create_driver(self._uri, self._username, self._password)
+        return self._driver
 
     def __enter__(self):
         self.connect()
@@ -197,27 +165,192 @@ def create_constraints_and_indexes(session):
     for query in constraints_and_indexes:
         session.run(query)
 
-def batch_import_nodes(session, node_label: str, nodes_data: List[Dict[str, Any]]):
-    if not nodes_data:
-        return
+def await_indexes(session, timeout_seconds: int = 300):
+    """
+    Blocks until every index, including those backing constraints, is
+    online. Indexes populate in the background after creation, and MERGEs
+    issued before then fall back to label scans.
+    """
+    session.run("CALL db.awaitIndexes($timeout)", timeout=timeout_seconds).consume()
 
+# Properties of the plain Article indexes `create_constraints_and_indexes`
+# creates, i.e. the ones a bulk load can drop and have recreated without
+# losing MERGE's unique-index seek on id.
+ARTICLE_SECONDARY_INDEX_PROPERTIES = ("title", "namespace")
+
+# Matches only those indexes: single-property range indexes (BTREE before
+# Neo4j 5) not backing a constraint. Fulltext, text, point and composite or
+# user-created indexes on other properties are left alone.
+SECONDARY_INDEXES_QUERY = """
+SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, owningConstraint
+WHERE entityType = 'NODE' AND type IN ['RANGE', 'BTREE'] AND owningConstraint IS NULL
+  AND labelsOrTypes = ['Article'] AND size(properties) = 1 AND properties[0] IN $properties
+RETURN name
+"""
+
+def drop_secondary_indexes(session) -> List[str]:
+    """
+    Drops the Article title and namespace indexes, so a bulk load does not
+    update them for every written node. Returns the dropped index names;
+    `create_constraints_and_indexes` recreates them.
+    """
+    properties = list(ARTICLE_SECONDARY_INDEX_PROPERTIES)
+    names = [record["name"] for record in session.run(SECONDARY_INDEXES_QUERY, properties=properties)]
+    for name in names:
+        # Index names cannot be parameters; escape backticks for quoting
+        session.run(f"DROP INDEX `{name.replace('`', '``')}` IF EXISTS").consume()
+    return names
+
+# The batch queries depend only on labels and property names, so each one
+# is built once and every batch sends the same text.
+@lru_cache(maxsize=64)
+def _node_merge_query(node_label: str) -> str:
     # Use MERGE on the unique 'id' property so re-imports are idempotent and
     # honour the unique constraint without throwing ConstraintErrors.
-    query = f"""
+    return f"""
     UNWIND $nodes AS node
     MERGE (n:{node_label} {{id: node.id}})
     SET n += node
     """
-    session.run(query, nodes=nodes_data)
-
-def batch_import_relationships(session, relationship_type: str, from_label: str, to_label: str, from_id_prop: str, to_id_prop: str, relationships_data: List[Dict[str, Any]]):
-    if not relationships_data:
-        return
 
-    query = f"""
+@lru_cache(maxsize=64)
+def _relationship_merge_query(relationship_type: str, from_label: str, to_label: str, from_id_prop: str, to_id_prop: str) -> str:
+    return f"""
     UNWIND $relationships AS rel
     MATCH (from_node:{from_label} {{id: rel.{from_id_prop}}})
     MATCH (to_node:{to_label} {{id: rel.{to_id_prop}}})
     MERGE (from_node)-[:{relationship_type}]->(to_node)
     """
-    session.run(query, relationships=relationships_data)
+
+def batch_import_nodes(session, node_label: str, nodes_data: List[Dict[str, Any]]):
+    if not nodes_data:
+        return
+
+    # Drain the result here so the next statement on this session or
+    # transaction does not wait for the driver to discard it.
+    return session.run(_node_merge_query(node_label), nodes=nodes_data).consume()
+
+ARTICLE_COLUMNS_QUERY = """
+UNWIND range(0, size($ids) - 1) AS i
+MERGE (n:Article {id: $ids[i]})
+SET n.title = $titles[i], n.url = $urls[i]
+"""
+
+def batch_import_article_columns(session, columns: Dict[str, List[Any]]):
+    """
+    Imports Article nodes from the parallel id/title/url lists produced by
+    `transform_batch`, indexing into them server-side. Returns the
+    statement's ResultSummary.
+    """
+    if not columns['id']:
+        return
+
+    result = session.run(ARTICLE_COLUMNS_QUERY, ids=columns['id'], titles=columns['title'], urls=columns['url'])
+    return result.consume()
+
+# Cypher for the batched load path; one statement per batch reuses one plan.
+LOAD_ARTICLES_QUERY = """
+UNWIND $rows AS r
+MERGE (a:Article {id: r.id})
+SET a.title = r.title, a.url = r.url
+"""
+
+# Link rows are (source_id, target_title) tuples rather than dicts: there
+# are many more links than articles, and the driver packs a list without
+# re-encoding two key strings per row. Targets are matched, not merged: a
+# node merged on title alone would have no id, and the article loader's
+# MERGE on id would later create a duplicate. Links to missing pages drop.
+LOAD_LINKS_QUERY = """
+UNWIND $rels AS r
+MATCH (s:Article {id: r[0]})
+MATCH (t:Article {title: r[1]})
+MERGE (s)-[:LINKS_TO]->(t)
+"""
+
+def _run_write(tx: Transaction, query: str, **params):
+    tx.run(query, **params).consume()
+
+def load_articles_batch(session, rows: List[Dict[str, Any]]):
+    """Merges a batch of Article rows (id, title, url) in one managed write transaction."""
+    if not rows:
+        return
+    session.execute_write(_run_write, LOAD_ARTICLES_QUERY, rows=rows)
+
+def load_links_batch(session, rels: List[Tuple[Any, str]]):
+    """Merges a batch of LINKS_TO rows, (source_id, target_title) tuples, in one managed write transaction."""
+    if not rels:
+        return
+    session.execute_write(_run_write, LOAD_LINKS_QUERY, rels=rels)
+
+# Server-side batching through APOC: Neo4j commits each `batch_size` slice
+# of $rows in its own transaction, so one call can carry more rows than fit
+# in a single transaction's memory. apoc.periodic.iterate manages its own
+# transactions, so it must run in an auto-commit transaction (session.run).
+LOAD_ARTICLES_PERIODIC_QUERY = """
+CALL apoc.periodic.iterate(
+    'UNWIND $rows AS r RETURN r',
+    'MERGE (a:Article {id: r.id}) SET a.title = r.title, a.url = r.url',
+    {batchSize: $batch_size, parallel: $parallel, params: {rows: $rows}}
+)
+YIELD total, errorMessages
+RETURN total, errorMessages
+"""
+
+def load_articles_periodic(session, rows: List[Dict[str, Any]], batch_size: int = 5000, parallel: bool = False) -> int:
+    """
+    Merges Article rows (id, title, url) with `apoc.periodic.iterate`,
+    letting the server split them into `batch_size` transactions, run on
+    several server threads with `parallel` (safe when the rows have distinct
+    ids). Returns the number of rows processed; raises RuntimeError if any
+    batch failed. Requires the APOC plugin.
+    """
+    if not rows:
+        return 0
+    record = session.run(LOAD_ARTICLES_PERIODIC_QUERY, rows=rows, batch_size=batch_size, parallel=parallel).single()
+    if record["errorMessages"]:
+        raise RuntimeError(f"apoc.periodic.iterate failed: {record['errorMessages']}")
+    return record["total"]
+
+# Sessions writing batches in parallel in `load_batches_concurrently`. Bolt
+# I/O releases the GIL, so threads overlap batches on the server.
+IMPORT_CONCURRENCY = int(os.getenv("NEO4J_IMPORT_CONCURRENCY", "4"))
+
+def load_batches_concurrently(
+    driver: Driver,
+    load_batch: Callable[[Any, Any], None],
+    batches: Iterable[Any],
+    concurrency: int = IMPORT_CONCURRENCY
+) -> int:
+    """
+    Calls `load_batch(session, batch)` (e.g. `load_articles_batch`) for every
+    batch on `concurrency` threads, each batch in its own session. At most two
+    batches per thread are in flight, so `batches` may be a lazy generator.
+    Returns the number of batches loaded; the first failure is re-raised.
+
+    Batches in one call run in any order, so load articles before the links
+    that MATCH them. Overlapping writes can deadlock on the server; the
+    `execute_write` based loaders retry those automatically.
+    """
+    def run(batch: Any) -> None:
+        with write_session(driver) as session:
+            load_batch(session, batch)
+
+    pending: deque = deque()
+    loaded = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch in batches:
+            pending.append(executor.submit(run, batch))
+            if len(pending) >= 2 * concurrency:
+                pending.popleft().result()
+                loaded += 1
+        while pending:
+            pending.popleft().result()
+            loaded += 1
+    return loaded
+
+def batch_import_relationships(session, relationship_type: str, from_label: str, to_label: str, from_id_prop: str, to_id_prop: str, relationships_data: List[Dict[str, Any]]):
+    if not relationships_data:
+        return
+
+    query = _relationship_merge_query(relationship_type, from_label, to_label, from_id_prop, to_id_prop)
+    return session.run(query, relationships=relationships_data).consume()
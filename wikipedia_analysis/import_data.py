@@ -1,7 +1,12 @@
-import xml.etree.ElementTree as ET
+import lxml.etree as ET
 import sys
 import os
-from wikipedia_analysis.database import Neo4jConnectionManager, create_article_node
+from wikipedia_analysis.database import (
+    Neo4jConnectionManager,
+    await_indexes,
+    batch_import_nodes,
+    create_constraints_and_indexes
+)
 
 # --- Configuration ---
 # Neo4j connection details
@@ -12,15 +17,27 @@ password = os.getenv("NEO4J_PASSWORD", "my_password") # Consider using a more se
 # XML file path
 xml_file = "wikipedia_analysis/pages-articles.xml"
 
+# MediaWiki element tags, built once and interned so every page compares
+# and looks up the same string objects instead of concatenating new ones.
+NS = sys.intern('{http://www.mediawiki.org/xml/export-0.10/}')
+NS_PAGE = sys.intern(NS + 'page')
+NS_ID = sys.intern(NS + 'id')
+NS_TITLE = sys.intern(NS + 'title')
+
+# Articles written per transaction; one UNWIND per batch instead of one
+# round trip per page.
+BATCH_SIZE = 1000
+
+def write_articles(session, rows):
+    """Merges a batch of article rows in one managed write transaction."""
+    session.execute_write(batch_import_nodes, "Article", rows)
+
 # --- Main Parsing Logic ---
 def parse_xml_and_import_to_neo4j(xml_file_path):
     """
     Parses a large XML file iteratively and imports data into Neo4j
     to avoid high memory consumption.
     """
-    # The namespace for MediaWiki XML elements
-    ns = '{http://www.mediawiki.org/xml/export-0.10/}'
-    
     print("Connecting to Neo4j...")
     try:
         with Neo4jConnectionManager(uri, username, password) as driver_manager:
@@ -31,48 +48,65 @@ def parse_xml_and_import_to_neo4j(xml_file_path):
 
             with driver.session() as session:
                 print("Connection successful.")
+                # Articles are MERGEd on id; without the unique constraint
+                # online every MERGE is a label scan.
+                create_constraints_and_indexes(session)
+                await_indexes(session)
                 print(f"Starting to parse and import {xml_file_path}...")
+                buffer = []
+                imported = 0
                 # Use iterparse for memory-efficient, event-based parsing.
-                # We only care about the 'end' event for each element.
-                context = ET.iterparse(xml_file_path, events=('end',))
+                # lxml filters on the tag in C, so only 'end' events for
+                # <page> elements reach Python.
+                context = ET.iterparse(
+                    xml_file_path, events=('end',), tag=NS_PAGE, huge_tree=True, remove_blank_text=True
+                )
                 
                 for event, elem in context:
                     # When a 'page' element is fully parsed, process it.
-                    if elem.tag == ns + 'page':
-                        try:
-                            article_id = elem.find(ns + 'id').text
-                            title = elem.find(ns + 'title').text
-                            # Skip pages without an ID or title
-                            if not article_id or not title:
-                                continue
+                    try:
+                        article_id = elem.find(NS_ID).text
+                        title = elem.find(NS_TITLE).text
+                        # Skip pages without an ID or title
+                        if not article_id or not title:
+                            continue
 
-                            # Assuming 'url' is not directly in the XML, construct it or remove if not needed
-                            # For now, let's pass a placeholder or remove if create_article_node doesn't need it
-                            # The database.py create_article_node expects id, title, namespace, redirect_title, is_redirect
-                            # We need to adapt this. For now, let's just pass what we have and add defaults.
-                            article_data = {
-                                "id": article_id,
-                                "title": title,
-                                "namespace": "0", # Default namespace for articles
-                                "redirect_title": None,
-                                "is_redirect": False
-                            }
-                            
-                            # Write to Neo4j in a transaction
-                            session.write_transaction(create_article_node, article_data)
+                        # Assuming 'url' is not directly in the XML, construct it or remove if not needed
+                        # For now, let's pass a placeholder or remove if create_article_node doesn't need it
+                        # The database.py create_article_node expects id, title, namespace, redirect_title, is_redirect
+                        # We need to adapt this. For now, let's just pass what we have and add defaults.
+                        article_data = {
+                            "id": article_id,
+                            "title": title,
+                            "namespace": "0", # Default namespace for articles
+                            "redirect_title": None,
+                            "is_redirect": False
+                        }
+                        
+                        buffer.append(article_data)
+                        if len(buffer) >= BATCH_SIZE:
+                            write_articles(session, buffer)
+                            imported += len(buffer)
+                            buffer = []
                             # Print progress to the console
-                            print(f"Imported: {title}")
+                            print(f"Imported: {imported} articles")
 
-                        except AttributeError as e:
-                            # This can happen if a page is missing an expected tag
-                            print(f"Skipping page due to parsing error: {e}", file=sys.stderr)
-                        
+                    except AttributeError as e:
+                        # This can happen if a page is missing an expected tag
+                        print(f"Skipping page due to parsing error: {e}", file=sys.stderr)
+                    finally:
                         # CRITICAL: Clear the element and its ancestors to free memory.
                         # This is the key to processing large files.
                         elem.clear()
                         while elem.getprevious() is not None:
                             del elem.getparent()[0]
                 
+                # Write whatever is left after the last full batch
+                if buffer:
+                    write_articles(session, buffer)
+                    imported += len(buffer)
+                    print(f"Imported: {imported} articles")
+
                 # Clean up the context iterator
                 del context
                 print("\nFinished importing all articles.")
@@ -1,8 +1,7 @@
-import xml.etree.ElementTree as ET
-from neo4j import GraphDatabase
+import lxml.etree as ET
 import sys
 import re
-from wikipedia_analysis.database import create_constraints_and_indexes
+from wikipedia_analysis.database import await_indexes, create_constraints_and_indexes, create_driver
 
 # --- Configuration ---
 # Neo4j connection details
@@ -14,42 +13,102 @@ password = "my_password"
 # XML file path
 xml_file = "wikipedia_analysis/pages-articles.xml"
 
+# Matches every [[...]]; category links are the ones whose target starts
+# with _CATEGORY_PREFIX, so one pass finds both. This is simplified; wikitext
+# is complex. A negated class instead of lazy `.*?` keeps it linear (no
+# backtracking) and lets Hyperscan, which has no lazy quantifiers, run it.
+_LINK_PATTERN = r'\[\[([^\]\n]*)\]\]'
+_LINK_RE = re.compile(_LINK_PATTERN)
+_CATEGORY_PREFIX = 'Category:'
+# Namespaced links that are not article-to-article links
+_SKIP_PREFIXES = ('File:', 'Category:', 'Image:', 'Template:')
+
+# Hyperscan compiles the link pattern to a DFA; the `re` pattern above is
+# used when it is unavailable.
+try:
+    import hyperscan
+    _WIKITEXT_DB = hyperscan.Database()
+    _WIKITEXT_DB.compile(expressions=[_LINK_PATTERN.encode()], flags=[hyperscan.HS_FLAG_SOM_LEFTMOST])
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# MediaWiki element tags, built once and interned so every page compares
+# and looks up the same string objects instead of concatenating new ones.
+NS = sys.intern('{http://www.mediawiki.org/xml/export-0.10/}')
+NS_PAGE = sys.intern(NS + 'page')
+NS_ID = sys.intern(NS + 'id')
+NS_TITLE = sys.intern(NS + 'title')
+NS_TEXT = sys.intern(f'.//{NS}text')
+
+# Pages written per transaction; one UNWIND per batch instead of one
+# round trip per page.
+BATCH_SIZE = 1000
+
 # --- Neo4j Functions ---
-def create_article_and_links(tx, article_id, title, links, categories):
-    """
-    Creates the source :Article node and merges relationships to target articles.
-    This is designed to be highly efficient by processing links in a batch.
+def create_articles_and_links(tx, rows):
     """
-    # 1. First, create or find the source article node.
-    # We use MERGE to avoid creating duplicate nodes on reruns.
-    query_source = """
-    MERGE (a:Article {id: $article_id})
-    SET a.title = $title
+    Merges a batch of source :Article nodes together with their LINKS_TO
+    relationships to target articles and BELONGS_TO relationships to
+    categories, in a single statement.
+    Each row is an (id, title, links, categories) tuple; positional rows
+    spare the driver packing the same four keys for every page.
     """
-    tx.run(query_source, article_id=article_id, title=title)
-
-    # 2. If there are links, create relationships.
-    if links:
-        # Use UNWIND to process a list of links in a single, fast operation.
-        # For each link title in our list, we find or create the target node
-        # and then create the LINKS_TO relationship.
-        query_links = """
-        MATCH (source:Article {id: $article_id})
-        UNWIND $links as target_title
+    # MERGE avoids creating duplicate nodes on reruns. FOREACH handles each
+    # row's (possibly empty) link and category lists without dropping the
+    # row the way an UNWIND of an empty list would.
+    query = """
+    UNWIND $rows AS r
+    MERGE (a:Article {id: r[0]})
+    SET a.title = r[1]
+    FOREACH (target_title IN r[2] |
         MERGE (target:Article {title: target_title})
-        MERGE (source)-[:LINKS_TO]->(target)
-        """
-        tx.run(query_links, article_id=article_id, links=links)
-
-    # 3. Create or find category nodes and establish relationships
-    if categories:
-        query_categories = """
-        MATCH (source:Article {id: $article_id})
-        UNWIND $categories as category_name
+        MERGE (a)-[:LINKS_TO]->(target)
+    )
+    FOREACH (category_name IN r[3] |
         MERGE (category:Category {name: category_name})
-        MERGE (source)-[:BELONGS_TO]->(category)
-        """
-        tx.run(query_categories, article_id=article_id, categories=categories)
+        MERGE (a)-[:BELONGS_TO]->(category)
+    )
+    """
+    tx.run(query, rows=rows).consume()
+
+def _scan_wikitext(wikitext):
+    """Returns the raw contents of every [[...]] in `wikitext`."""
+    if HYPERSCAN_AVAILABLE:
+        buf = wikitext.encode('utf-8')
+        spans = []
+        _WIKITEXT_DB.scan(buf, match_event_handler=lambda _id, start, end, _flags, _ctx: spans.append((start, end)))
+        # The delimiters are ASCII, so the byte offsets never split a character
+        return [buf[start + 2:end - 2].decode('utf-8') for start, end in spans]
+    return _LINK_RE.findall(wikitext)
+
+def extract_links_and_categories(wikitext):
+    """
+    Returns the set of linked article titles (without display text, section
+    anchors or File/Category/Image/Template links) and the set of category
+    names in `wikitext`.
+    """
+    if not wikitext or '[[' not in wikitext:
+        return set(), set()
+
+    categories = set()
+    cleaned_links = set()
+    for link in _scan_wikitext(wikitext):
+        # Every skipped prefix contains a colon; most links do not
+        if ':' in link:
+            if link.startswith(_CATEGORY_PREFIX):
+                # Drop the sort key (e.g., [[Category:Name|Sort key]])
+                categories.add(sys.intern(link[len(_CATEGORY_PREFIX):].partition('|')[0].strip()))
+                continue
+            if any(prefix in link for prefix in _SKIP_PREFIXES):
+                continue
+
+        # Remove display text (e.g., [[Target|Display Text]]) and section
+        # links (e.g., [[Target#Section]]); partition builds no list.
+        clean_link = link.partition('|')[0].partition('#')[0].strip()
+        if clean_link:
+            cleaned_links.add(clean_link)
+    return cleaned_links, categories
 
 # --- Main Parsing Logic ---
 def parse_wikitext_and_import(xml_file_path):
@@ -57,75 +116,69 @@ def parse_wikitext_and_import(xml_file_path):
     Parses the Wikipedia XML, extracts article text and internal links,
     and imports the structure into Neo4j.
     """
-    # The namespace for MediaWiki XML elements
-    ns = '{http://www.mediawiki.org/xml/export-0.10/}'
-    
     print("Connecting to Neo4j...")
     try:
-        with GraphDatabase.driver(uri, auth=(username, password)) as driver:
+        with create_driver(uri, username, password) as driver:
             driver.verify_connectivity()
             print("Connection successful.")
             
             with driver.session() as session:
+                # Every link MERGEs its target by title, so the Article.title
+                # index must be online before the first batch.
                 create_constraints_and_indexes(session)
+                await_indexes(session)
                 print("Ensured Neo4j constraints and indexes are in place.")
                 print(f"Starting to parse and import links from {xml_file_path}...")
                 print("NOTE: This process will be significantly slower than the first import.")
+                buffer = []
+                imported = 0
 
                 # Use iterparse for memory-efficient, event-based parsing.
-                context = ET.iterparse(xml_file_path, events=('end',))
+                # lxml filters on the tag in C, so only 'end' events for
+                # <page> elements reach Python.
+                context = ET.iterparse(
+                    xml_file_path, events=('end',), tag=NS_PAGE, huge_tree=True, remove_blank_text=True
+                )
                 
                 for event, elem in context:
                     # When a 'page' element is fully parsed, process it.
-                    if elem.tag == ns + 'page':
-                        try:
-                            article_id = elem.find(ns + 'id').text
-                            title = elem.find(ns + 'title').text
-                            
-                            # Find the article text, which is in the 'revision/text' element
-                            wikitext_element = elem.find(f'.//{ns}text')
-                            wikitext = wikitext_element.text if wikitext_element is not None else ""
-
-                            if not article_id or not title:
-                                continue
-
-                            # Use regex to find all [[Internal Link]] patterns.
-                            # This is a simplified pattern; wikitext is complex.
-                            raw_links = re.findall(r'\[\[(.*?)\]\]', wikitext or "")
-                            
-                            # Extract categories
-                            categories = set()
-                            category_matches = re.findall(r'\[\[Category:(.*?)(?:\|.*?)?\]\]', wikitext or "")
-                            for category in category_matches:
-                                categories.add(category.strip())
-
-                            # Clean the links: remove pipe tricks, section links, and file/category links.
-                            cleaned_links = set()
-                            for link in raw_links:
-                                if any(prefix in link for prefix in ['File:', 'Category:', 'Image:', 'Template:']):
-                                    continue
-                                # Remove display text (e.g., [[Target|Display Text]])
-                                clean_link = link.split('|')[0]
-                                # Remove section links (e.g., [[Target#Section]])
-                                clean_link = clean_link.split('#')[0]
-                                clean_link = clean_link.strip()
-                                if clean_link:
-                                    cleaned_links.add(clean_link)
-                            
+                    try:
+                        article_id = elem.find(NS_ID).text
+                        title = elem.find(NS_TITLE).text
+                        
+                        # Find the article text, which is in the 'revision/text' element
+                        wikitext_element = elem.find(NS_TEXT)
+                        wikitext = wikitext_element.text if wikitext_element is not None else ""
+
+                        if not article_id or not title:
+                            continue
+
+                        # Find all [[Internal Link]] and [[Category:...]] patterns
+                        cleaned_links, categories = extract_links_and_categories(wikitext)
+                        
+                        buffer.append((article_id, title, list(cleaned_links), list(categories)))
+                        if len(buffer) >= BATCH_SIZE:
                             # Write to Neo4j in a transaction
-                            session.write_transaction(create_article_and_links, article_id, title, list(cleaned_links), list(categories))
-                            
+                            session.execute_write(create_articles_and_links, buffer)
+                            imported += len(buffer)
+                            buffer = []
                             # Print progress
-                            print(f"Imported: '{title}' with {len(cleaned_links)} links and {len(categories)} categories.")
+                            print(f"Imported: {imported} articles.")
 
-                        except AttributeError as e:
-                            print(f"Skipping page due to parsing error: {e}", file=sys.stderr)
-                        
+                    except AttributeError as e:
+                        print(f"Skipping page due to parsing error: {e}", file=sys.stderr)
+                    finally:
                         # CRITICAL: Clear the element to free memory.
                         elem.clear()
                         while elem.getprevious() is not None:
                             del elem.getparent()[0]
                 
+                # Write whatever is left after the last full batch
+                if buffer:
+                    session.execute_write(create_articles_and_links, buffer)
+                    imported += len(buffer)
+                    print(f"Imported: {imported} articles.")
+
                 del context
                 print("\nFinished importing all articles and links.")
 
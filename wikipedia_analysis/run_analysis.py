@@ -1,24 +1,104 @@
-from neo4j import GraphDatabase
+import time
+
+from neo4j.exceptions import ClientError
+
 from wikipedia_analysis.config import load_neo4j_config
+from wikipedia_analysis.database import create_driver
+from wikipedia_analysis.analysis import ANALYSIS_FETCH_SIZE, ensure_projection
+
+# --- Cypher Queries ---
+# Kept as module constants with values passed as parameters, so the query
+# text is identical on every run and Neo4j reuses the cached plan.
+
+# In-degree read from the GDS projection, so no relationships are expanded
+# in the store; works on both Neo4j 4.4 and 5.
+AUTHORITATIVE_ARTICLES_QUERY = """
+CALL gds.degree.stream($project_name, {orientation: 'REVERSE'})
+YIELD nodeId, score
+// Keep the top rows before resolving titles
+WITH nodeId, score
+ORDER BY score DESC
+LIMIT $limit
+RETURN gds.util.asNode(nodeId).title AS article, toInteger(score) AS in_degree
+"""
+
+# Used when GDS is not installed; counts incoming :LINKS_TO relationships.
+AUTHORITATIVE_ARTICLES_FALLBACK_QUERY = """
+MATCH (a:Article)<-[:LINKS_TO]-()
+WITH a, count(*) AS in_degree
+RETURN a.title AS article, in_degree
+ORDER BY in_degree DESC
+LIMIT $limit
+"""
+
+# One GDS projection, built by `ensure_projection`, serves every GDS step
+# below and is dropped when the script finishes.
+PROJECT_NAME = "wikipedia"
+DROP_GRAPH_QUERY = "CALL gds.graph.drop($project_name, false)"
+
+PAGERANK_WRITE_QUERY = """
+CALL gds.pageRank.write(
+    $project_name, 
+    { writeProperty: 'influence_score' }
+)
+"""
+
+TOP_INFLUENCERS_QUERY = """
+MATCH (a:Article)
+WHERE a.influence_score IS NOT NULL
+RETURN a.title AS article, a.influence_score AS score
+ORDER BY score DESC
+LIMIT $limit
+"""
+
+KNOWLEDGE_PATH_QUERY = """
+MATCH (start:Article {title: $start_article}), (end:Article {title: $end_article})
+// Use the shortestPath function to find a path up to 10 links deep.
+MATCH path = shortestPath((start)-[:LINKS_TO*..10]->(end))
+// Return the titles of the articles in the path.
+RETURN [node in nodes(path) | node.title] AS path_titles
+"""
+
+# Loads node, relationship and index pages into the page cache.
+# apoc.warmup.run exists in APOC 4.x but was removed in APOC 5, where the
+# scans below are the fallback. They read a property and expand the
+# relationships, because a bare count() is answered from the count store
+# without touching the store files.
+WARMUP_QUERY = "CALL apoc.warmup.run(true, true, true)"
+WARMUP_FALLBACK_QUERIES = (
+    "MATCH (a:Article) RETURN count(a.title) AS n",
+    "MATCH (:Article)-[r:LINKS_TO]->(:Article) RETURN count(r) AS n",
+)
 
 # --- Analysis Functions ---
 
+def warm_page_cache(session):
+    """
+    Touches the Article graph so the analysis queries below run against a
+    warm page cache instead of paying for cold disk reads on first use.
+    """
+    print("\n--- Warming the Neo4j page cache ---")
+    started = time.perf_counter()
+    try:
+        session.run(WARMUP_QUERY).consume()
+    except ClientError:
+        # APOC missing or without apoc.warmup.run
+        for query in WARMUP_FALLBACK_QUERIES:
+            session.run(query).consume()
+    print(f"Page cache warmed in {time.perf_counter() - started:.1f}s")
+
 def find_most_authoritative_articles(session, limit=20):
     """
     Identifies authoritative articles by counting incoming links (in-degree).
     These are the most heavily referenced articles in the network.
     """
     print(f"\n--- Finding Top {limit} Most Authoritative Articles (by incoming links) ---")
-    query = """
-    MATCH (a:Article)
-    // Calculate the in-degree by counting incoming :LINKS_TO relationships
-    WITH a, size((a)<-[:LINKS_TO]-()) as in_degree
-    // Return the title and the score
-    RETURN a.title AS article, in_degree
-    ORDER BY in_degree DESC
-    LIMIT $limit
-    """
-    result = session.run(query, limit=limit)
+    try:
+        ensure_projection(session, PROJECT_NAME)
+        result = list(session.run(AUTHORITATIVE_ARTICLES_QUERY, project_name=PROJECT_NAME, limit=limit))
+    except ClientError:
+        # GDS missing
+        result = session.run(AUTHORITATIVE_ARTICLES_FALLBACK_QUERY, limit=limit)
     for i, record in enumerate(result, 1):
         print(f"{i}. {record['article']} (Cited by {record['in_degree']} articles)")
 
@@ -33,49 +113,30 @@ def calculate_influence_score(session):
     print("\n--- Calculating Influence Score for all Articles (using PageRank) ---")
     print("This may take a few minutes on the full dataset...")
 
-    # 1. Check if the GDS graph projection already exists, and drop it if it does.
-    check_graph_query = "CALL gds.graph.exists('wikipedia_graph') YIELD exists"
-    result = session.run(check_graph_query)
-    if result.single()['exists']:
-        print("Dropping existing GDS graph projection...")
-        drop_graph_query = "CALL gds.graph.drop('wikipedia_graph')"
-        session.run(drop_graph_query)
-    
-    # 2. Project the graph into GDS's in-memory format for high-speed analysis.
+    # 1. Project the graph into GDS's in-memory format, reusing the
+    #    projection if an earlier step already built it.
     print("Projecting graph into GDS memory...")
-    project_graph_query = """
-    CALL gds.graph.project(
-        'wikipedia_graph', 
-        'Article', 
-        'LINKS_TO'
-    )
-    """
-    session.run(project_graph_query)
+    ensure_projection(session, PROJECT_NAME)
     
-    # 3. Run the PageRank algorithm and write the results back to the nodes.
+    # 2. Run the PageRank algorithm and write the results back to the nodes.
     print("Running PageRank algorithm...")
-    pagerank_query = """
-    CALL gds.pageRank.write(
-        'wikipedia_graph', 
-        { writeProperty: 'influence_score' }
-    )
-    """
-    session.run(pagerank_query)
+    session.run(PAGERANK_WRITE_QUERY, project_name=PROJECT_NAME).consume()
     print("PageRank calculation complete. 'influence_score' property added to nodes.")
 
+def drop_projection(session):
+    """Frees the GDS projection built by the analyses above, if any."""
+    try:
+        session.run(DROP_GRAPH_QUERY, project_name=PROJECT_NAME).consume()
+    except ClientError:
+        # GDS missing
+        pass
+
 def find_top_influencers(session, limit=20):
     """
     Finds the articles with the highest influence score after PageRank has been run.
     """
     print(f"\n--- Finding Top {limit} Most Influential Articles (by PageRank score) ---")
-    query = """
-    MATCH (a:Article)
-    WHERE a.influence_score IS NOT NULL
-    RETURN a.title AS article, a.influence_score AS score
-    ORDER BY score DESC
-    LIMIT $limit
-    """
-    result = session.run(query, limit=limit)
+    result = session.run(TOP_INFLUENCERS_QUERY, limit=limit)
     for i, record in enumerate(result, 1):
         print(f"{i}. {record['article']} (Influence Score: {record['score']:.4f})")
         
@@ -85,14 +146,7 @@ def find_knowledge_path(session, start_article, end_article):
     between two articles.
     """
     print(f"\n--- Finding shortest knowledge path from '{start_article}' to '{end_article}' ---")
-    query = """
-    MATCH (start:Article {title: $start_article}), (end:Article {title: $end_article})
-    // Use the shortestPath function to find a path up to 10 links deep.
-    MATCH path = shortestPath((start)-[:LINKS_TO*..10]->(end))
-    // Return the titles of the articles in the path.
-    RETURN [node in nodes(path) | node.title] AS path_titles
-    """
-    result = session.run(query, start_article=start_article, end_article=end_article)
+    result = session.run(KNOWLEDGE_PATH_QUERY, start_article=start_article, end_article=end_article)
     path_record = result.single()
     if path_record:
         print(" -> ".join(path_record['path_titles']))
@@ -102,17 +156,22 @@ def find_knowledge_path(session, start_article, end_article):
 # --- Main Execution ---
 if __name__ == "__main__":
     cfg = load_neo4j_config()
-    with GraphDatabase.driver(cfg.uri, auth=(cfg.user, cfg.password)) as driver:
+    with create_driver(cfg.uri, cfg.user, cfg.password) as driver:
         driver.verify_connectivity()
-        with driver.session() as session:
-            # Run the analyses
-            find_most_authoritative_articles(session)
-            
-            # Note: The PageRank functions require Neo4j GDS library.
-            # If you don't have it, you can comment out the next two function calls.
-            calculate_influence_score(session)
-            find_top_influencers(session)
-
-            # Find a path between two interesting topics
-            find_knowledge_path(session, "Graph theory", "Social network")
-            find_knowledge_path(session, "United States", "World War II")
+        with driver.session(fetch_size=ANALYSIS_FETCH_SIZE) as session:
+            warm_page_cache(session)
+
+            try:
+                # Run the analyses
+                find_most_authoritative_articles(session)
+                
+                # Note: The PageRank functions require Neo4j GDS library.
+                # If you don't have it, you can comment out the next two function calls.
+                calculate_influence_score(session)
+                find_top_influencers(session)
+
+                # Find a path between two interesting topics
+                find_knowledge_path(session, "Graph theory", "Social network")
+                find_knowledge_path(session, "United States", "World War II")
+            finally:
+                drop_projection(session)
@@ -1,23 +1,252 @@
+import argparse
+import csv
+import gc
+import queue
+import subprocess
 import sys
+import threading
 import time
 import os
-from wikipedia_analysis.data_processing import parse_dump_file, batch_data, transform_to_article_node
-from wikipedia_analysis.database import Neo4jConnectionManager, batch_import_nodes
+from neo4j.exceptions import ServiceUnavailable
+from wikipedia_analysis.data_processing import parse_dump_file, batch_data, transform_batch, transform_to_article_node
+from wikipedia_analysis.database import (
+    IMPORT_CONCURRENCY,
+    Neo4jConnectionManager,
+    await_indexes,
+    batch_import_article_columns,
+    create_constraints_and_indexes,
+    drop_secondary_indexes,
+    load_articles_batch,
+    load_articles_periodic,
+    load_batches_concurrently,
+    load_links_batch,
+    write_session
+)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Articles per write transaction in `load_dump`
+LOAD_BATCH_SIZE = 10_000
+
+# Parsed batches committed per write transaction in `streaming_import`. A
+# commit costs a round trip and a log flush, so small parse batches are
+# grouped into transactions of batch_size * TX_MULTIPLIER articles to start
+# with; AdaptiveBatchSize then tunes the size from write latency.
+TX_MULTIPLIER = 20
+
+# Parsed batches buffered between the parse thread and the writer in
+# `streaming_import`; bounds memory if Neo4j falls behind the parser.
+PREFETCH_DEPTH = 4
+
+# Generation thresholds while importing. Parsing allocates thousands of
+# short-lived, acyclic objects per batch that refcounting already frees, so
+# the default gen-0 threshold (700) only buys frequent pointless GC passes;
+# cycles are instead collected once per batch in `streaming_import`.
+IMPORT_GC_THRESHOLDS = (50_000, 20, 20)
+
+# Minimum seconds between progress lines in `streaming_import`; printing every
+# batch costs a terminal write per few dozen articles on fast imports.
+PROGRESS_INTERVAL = 2.0
+
+# System memory use, in percent, above which `check_memory_pressure` reports pressure
+MEMORY_PERCENT_LIMIT = 85
+
+# Resident set size of this process above which `check_memory_pressure`
+# reports pressure; set with RSS_LIMIT_MB.
+RSS_LIMIT = int(os.getenv("RSS_LIMIT_MB", "4096")) * 1024 * 1024
+
+# Reused so each check is one read of the process's own counters
+_PROCESS = psutil.Process() if PSUTIL_AVAILABLE else None
 
 def check_memory_pressure():
-    """Simple memory check before processing"""
-    import subprocess
+    """
+    Simple memory check before processing: False once this process's RSS
+    passes RSS_LIMIT or system memory use passes MEMORY_PERCENT_LIMIT. Reads
+    the kernel's counters in-process via psutil, cheaply enough to run every
+    batch; without psutil it assumes memory is fine.
+    """
+    if not PSUTIL_AVAILABLE:
+        return True
+    if _PROCESS.memory_info().rss >= RSS_LIMIT:
+        return False
+    return psutil.virtual_memory().percent < MEMORY_PERCENT_LIMIT
+
+# Seconds the parser sleeps under memory pressure, and the minimum seconds
+# between such pauses. A pause lets the writers drain queued batches but
+# cannot shrink RSS (the allocator rarely returns freed memory to the OS),
+# so pressure that persists must not stall every batch.
+MEMORY_PAUSE_SECONDS = 5
+MEMORY_PAUSE_INTERVAL = 60
+
+class MemoryBackoff:
+    """Pauses the parser under memory pressure, at most once per MEMORY_PAUSE_INTERVAL."""
+
+    def __init__(self):
+        self.last_pause = None
+
+    def check(self):
+        """Checks memory pressure and pauses if due; returns whether it paused."""
+        if check_memory_pressure():
+            return False
+        now = time.monotonic()
+        if self.last_pause is not None and now - self.last_pause < MEMORY_PAUSE_INTERVAL:
+            return False
+        print("⚠️  High memory pressure detected - pausing...")
+        time.sleep(MEMORY_PAUSE_SECONDS)
+        self.last_pause = time.monotonic()
+        return True
+
+def write_article_columns(session, columns):
+    """
+    Writes one batch of Article columns in a managed, retried write
+    transaction and returns its ResultSummary.
+    """
+    return session.execute_write(batch_import_article_columns, columns)
+
+class AdaptiveBatchSize:
+    """
+    Write transaction size tuned from measured write latency: doubled while
+    writes finish under `fast` seconds, halved when one takes over `slow`
+    seconds or fails, and kept within [minimum, maximum]. Too small a
+    transaction pays a commit per few rows; too large a one holds locks and
+    server memory for longer than it saves.
+    """
+
+    def __init__(self, initial, minimum=50, maximum=10_000, fast=0.3, slow=1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.fast = fast
+        self.slow = slow
+        self.size = min(max(initial, minimum), maximum)
+
+    def record(self, elapsed):
+        """Adjusts the size after a write that took `elapsed` seconds."""
+        if elapsed < self.fast:
+            self.size = min(self.size * 2, self.maximum)
+        elif elapsed > self.slow:
+            self.shrink()
+
+    def shrink(self):
+        self.size = max(self.size // 2, self.minimum)
+
+    def timed(self, write):
+        """Wraps `write(session, batch)` so every call feeds its latency back into the size."""
+        def timed_write(session, batch):
+            started = time.perf_counter()
+            try:
+                result = write(session, batch)
+            except Exception:
+                self.shrink()
+                raise
+            self.record(time.perf_counter() - started)
+            return result
+        return timed_write
+
+# Rows per server-side transaction when `streaming_import` writes through
+# apoc.periodic.iterate
+PERIODIC_BATCH_SIZE = 1000
+
+# Rows accumulated client-side per apoc.periodic.iterate call. Several
+# PERIODIC_BATCH_SIZE partitions per call give `parallel: true` something to
+# run concurrently; a call of one partition commits serially.
+PERIODIC_GROUP_SIZE = 10 * PERIODIC_BATCH_SIZE
+
+def write_article_columns_periodic(session, columns):
+    """
+    Writes one batch of Article columns with apoc.periodic.iterate, which
+    splits it into PERIODIC_BATCH_SIZE transactions committed in parallel
+    on the server. Runs auto-commit, as the procedure manages its own
+    transactions; requires the APOC plugin.
+    """
+    rows = [
+        {'id': article_id, 'title': title, 'url': url}
+        for article_id, title, url in zip(columns['id'], columns['title'], columns['url'])
+    ]
+    load_articles_periodic(session, rows, batch_size=PERIODIC_BATCH_SIZE, parallel=True)
+
+def _group_columns(batches, size):
+    """
+    Concatenates Article column batches into batches of at least `size` rows
+    (the last may be smaller). `size` may be an AdaptiveBatchSize, read
+    again for every batch.
+    """
+    pending = {}
+    for columns in batches:
+        for key, values in columns.items():
+            pending.setdefault(key, []).extend(values)
+        if len(pending['id']) >= getattr(size, 'size', size):
+            yield pending
+            pending = {}
+    if pending:
+        yield pending
+
+def _put(q, item, stop):
+    """Puts `item` on `q`, giving up once `stop` is set; returns whether it was queued."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _producer(batches, q, stop, errors):
+    """Feeds `batches` into `q` until exhausted or `stop` is set, then a None sentinel."""
     try:
-        result = subprocess.run(['memory_pressure'], capture_output=True, text=True)
-        memory_pressure_status = "normal" in result.stdout.lower()
-        print(f"Memory pressure status: {memory_pressure_status}")
-        return memory_pressure_status
-    except Exception as e:
-        print(f"Error checking memory pressure: {e}")
-        return True  # Assume OK if can't check
+        for batch in batches:
+            if not _put(q, batch, stop):
+                # The consumer is gone; close the source now so it releases
+                # its file (or decompressor process) without waiting for GC.
+                close = getattr(batches, 'close', None)
+                if close is not None:
+                    close()
+                return
+    except BaseException as e:
+        errors.append(e)
+    _put(q, None, stop)
 
-def streaming_import(xml_file, batch_size=100):
-    """Memory-efficient streaming import using data_processing module."""
+def _prefetch(batches, depth=PREFETCH_DEPTH):
+    """
+    Yields the items of `batches`, producing them on a background thread up
+    to `depth` ahead, so parsing overlaps the caller's writes. An exception
+    raised while producing is re-raised here once the earlier items are consumed.
+    """
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    thread = threading.Thread(target=_producer, args=(batches, q, stop, errors), daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = q.get()
+            if batch is None:
+                break
+            yield batch
+    finally:
+        stop.set()
+        thread.join()
+    if errors:
+        raise errors[0]
+
+def streaming_import(xml_file, batch_size=100, concurrency=IMPORT_CONCURRENCY, workers=None, bulk=False, apoc=False):
+    """
+    Memory-efficient streaming import using data_processing module.
+    With `concurrency` > 1 (the default, NEO4J_IMPORT_CONCURRENCY), batches
+    are written by that many threads, each on its own session, while this
+    thread keeps parsing; `execute_write` retries transient errors such as
+    deadlocks with backoff. With `concurrency` = 1 a background thread
+    parses ahead while this thread writes. `workers` > 1 moves page-to-article
+    extraction into that many processes (see `parse_dump_file`), leaving the
+    GIL to the parser and the writers. With `bulk`, the Article indexes the
+    import does not read (title, namespace) are dropped for the load and
+    rebuilt once afterwards; the id constraint MERGE relies on stays. With
+    `apoc`, each write goes through `write_article_columns_periodic`, so the
+    server batches and parallelises the MERGEs.
+    """
     from wikipedia_analysis.config import load_neo4j_config
     cfg = load_neo4j_config()
     uri, username, password = cfg.uri, cfg.user, cfg.password
@@ -25,52 +254,202 @@ def streaming_import(xml_file, batch_size=100):
     print(f"Connecting to Neo4j with uri: {uri}, username: {username}")
     
     processed_articles = 0
+    # Nodes created per write, from each ResultSummary; list.append is safe
+    # from the concurrent writer threads. Re-imported articles are MERGEd
+    # onto existing nodes and count as processed but not created.
+    created_counts = []
+    last_report = time.monotonic()
+    memory_backoff = MemoryBackoff()
     
     print("Starting streaming import...")
     
+    def column_batches():
+        nonlocal processed_articles, last_report
+        for batch in batch_data(parse_dump_file(xml_file, workers=workers), batch_size):
+            # Transform raw parsed data into Article node columns
+            # parse_dump_file never yields empty records, so no filtering pass
+            columns = transform_batch(batch)
+            # Drop the parsed articles (and their link lists) now; otherwise
+            # they stay alive while the columns wait in the prefetch queue.
+            del batch
+            
+            if columns['id']:
+                yield columns
+                # The batch has been handed off; collect the young generations
+                # now rather than mid-parse.
+                gc.collect(1)
+                processed_articles += len(columns['id'])
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    print(f"✓ Processed {processed_articles} articles...")
+                    last_report = now
+                
+                # Check memory pressure every batch; pausing the parser lets
+                # the writers drain the queued batches.
+                memory_backoff.check()
+
+    default_thresholds = gc.get_threshold()
+    gc.set_threshold(*IMPORT_GC_THRESHOLDS)
     try:
-        article_data_iterator = parse_dump_file(xml_file)
-        
         with Neo4jConnectionManager(uri, username, password) as driver_manager:
             driver = driver_manager.get_driver()
             if not driver:
                 print("Failed to get Neo4j driver. Exiting.", file=sys.stderr)
                 return False
 
-            with driver.session() as session:
-                for batch in batch_data(article_data_iterator, batch_size):
-                    # Transform raw parsed data into Neo4j node format
-                    transformed_articles = [transform_to_article_node(article) for article in batch if article]
-                    
-                    if transformed_articles:
-                        # Use batch_import_nodes from database.py
-                        batch_import_nodes(session, "Article", transformed_articles)
-                        processed_articles += len(transformed_articles)
-                        print(f"✓ Processed {processed_articles} articles...")
-                        
-                        # Check memory pressure every 1000 articles
-                        if processed_articles % 1000 == 0:
-                            if not check_memory_pressure():
-                                print("⚠️  High memory pressure detected - pausing...")
-                                time.sleep(5)
+            # Every batch MERGEs on Article.id; the unique constraint's
+            # index must be online first or each MERGE is a label scan.
+            with write_session(driver) as session:
+                create_constraints_and_indexes(session)
+                if bulk:
+                    # Before awaiting, so the dropped indexes are not populated first
+                    dropped = drop_secondary_indexes(session)
+                    print(f"Dropped indexes for the bulk load: {', '.join(dropped) or 'none'}")
+                await_indexes(session)
+
+            if apoc:
+                # The server sizes the transactions, so the adaptive client
+                # size does not apply.
+                tx_batches = _group_columns(column_batches(), PERIODIC_GROUP_SIZE)
+                timed_write = write_article_columns_periodic
+            else:
+                tx_size = AdaptiveBatchSize(batch_size * TX_MULTIPLIER, minimum=batch_size)
+                tx_batches = _group_columns(column_batches(), tx_size)
+                timed_write = tx_size.timed(write_article_columns)
+
+            def write(session, columns):
+                summary = timed_write(session, columns)
+                # apoc.periodic.iterate reports rows processed, not created
+                if summary is not None:
+                    created_counts.append(summary.counters.nodes_created)
+
+            try:
+                if concurrency > 1:
+                    load_batches_concurrently(driver, write, tx_batches, concurrency)
+                else:
+                    with write_session(driver) as session:
+                        for columns in _prefetch(tx_batches):
+                            write(session, columns)
+            finally:
+                if bulk:
+                    # Rebuild in one pass, even after a failed load
+                    print("Rebuilding indexes...")
+                    with write_session(driver) as session:
+                        create_constraints_and_indexes(session)
+                        await_indexes(session)
         
-        print(f"🎉 Import complete! Total: {processed_articles} articles")
+        created = f" ({sum(created_counts)} new)" if created_counts else ""
+        print(f"🎉 Import complete! Total: {processed_articles} articles{created}")
         
+    except ServiceUnavailable as e:
+        # Raised by the connectivity check on entering the connection
+        # manager, before the dump is opened.
+        print(f"❌ Neo4j is unreachable at {uri}: {e}")
+        return False
     except Exception as e:
         print(f"❌ Error during streaming import: {e}")
         return False
+    finally:
+        gc.set_threshold(*default_thresholds)
     
     return True
 
+def load_dump(session, xml_file, batch_size=LOAD_BATCH_SIZE):
+    """
+    Loads articles and their LINKS_TO relationships from a dump, writing each
+    batch with one UNWIND statement per kind. Returns the number of articles.
+    Links are loaded in a second pass over the dump, once every article
+    exists, because the link query only matches existing target nodes.
+    """
+    loaded = 0
+    for batch in batch_data(parse_dump_file(xml_file), batch_size):
+        rows = [node for node in map(transform_to_article_node, batch) if node is not None]
+        load_articles_batch(session, rows)
+        loaded += len(rows)
+
+    for batch in batch_data(parse_dump_file(xml_file), batch_size):
+        rels = []
+        for article in batch:
+            node = transform_to_article_node(article)
+            if node is None:
+                continue
+            rels.extend((node['id'], link) for link in article.get('links', ()))
+        load_links_batch(session, rels)
+    return loaded
+
+# Header of the node file written for `neo4j-admin database import`. Page
+# ids are integers, so they are imported with --id-type=integer and stored
+# as the same integer `id` property the Bolt loaders MERGE on.
+ARTICLE_CSV_HEADER = ('id:ID', 'title', 'url')
+
+def write_article_csv(xml_file, csv_path, batch_size=LOAD_BATCH_SIZE):
+    """
+    Streams the Article nodes of a dump into a neo4j-admin node CSV at
+    `csv_path`. Returns the number of articles written.
+    """
+    written = 0
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(ARTICLE_CSV_HEADER)
+        for batch in batch_data(parse_dump_file(xml_file), batch_size):
+            columns = transform_batch(batch)
+            writer.writerows(zip(columns['id'], columns['title'], columns['url']))
+            written += len(columns['id'])
+    return written
+
+def offline_import(xml_file, output_dir='.', database='neo4j', run_import=True):
+    """
+    Cold-loads a dump with `neo4j-admin database import full`, which writes
+    the store files directly instead of going through Bolt and the
+    transaction log. The target database must be stopped and is replaced.
+    With `run_import` False only the CSV is written. Returns the number of
+    articles written.
+    """
+    csv_path = os.path.join(output_dir, 'articles.csv')
+    written = write_article_csv(xml_file, csv_path)
+    print(f"✓ Wrote {written} articles to {csv_path}")
+    if run_import:
+        subprocess.run(
+            [
+                'neo4j-admin', 'database', 'import', 'full',
+                f'--nodes=Article={csv_path}', '--id-type=integer', '--overwrite-destination',
+                database,
+            ],
+            check=True,
+        )
+    return written
+
 if __name__ == "__main__":
-    xml_file = "wikipedia_analysis/pages-articles.xml"
+    parser = argparse.ArgumentParser(description="Stream a Wikipedia dump into Neo4j.")
+    parser.add_argument('xml_file', nargs='?', default="wikipedia_analysis/pages-articles.xml",
+                        help="dump to import; .bz2 and .gz dumps are decompressed on the fly")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes extracting articles from parsed pages (default: parse in-process)")
+    parser.add_argument('--bulk', action='store_true',
+                        help="drop secondary Article indexes during the load and rebuild them afterwards")
+    parser.add_argument('--apoc', action='store_true',
+                        help="let apoc.periodic.iterate batch the writes server-side (requires APOC)")
+    parser.add_argument('--offline', action='store_true',
+                        help="write articles.csv and load it with neo4j-admin (database must be stopped)")
+    args = parser.parse_args()
+    xml_file = args.xml_file
+    if not os.path.exists(xml_file) and os.path.exists(xml_file + '.bz2'):
+        # Read the compressed dump as downloaded, no extraction needed
+        xml_file += '.bz2'
     
     if not os.path.exists(xml_file):
         print(f"❌ Error: XML file not found at {xml_file}")
         success = False
+    elif args.offline:
+        try:
+            offline_import(xml_file)
+            success = True
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Error during offline import: {e}")
+            success = False
     else:
         print(f"✅ XML file found at {xml_file}")
-        success = streaming_import(xml_file, batch_size=50)  # Smaller batches
+        success = streaming_import(xml_file, batch_size=50, workers=args.workers, bulk=args.bulk, apoc=args.apoc)  # Smaller batches
     
     if success:
         print("Import completed successfully!")